@@ -0,0 +1,341 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Benchmark suite for the graph classes. Builds Erdos-Renyi, grid, power-law and
+# random path graphs of 10^2 .. 10^6 vertices, records wall time and peak memory of every operation
+# to JSON, flags operations whose cost grows faster than linearly, and compares a run against a
+# saved baseline.
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from csr_graph import CSRDirectedGraph
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+# the dense adjacency matrix needs V^2 cells, so DirectedGraph only runs on small graphs
+DENSE_LIMIT = 2000
+
+# cost growth exponent above which an operation is reported as superlinear
+SUPERLINEAR = 1.5
+
+# timings shorter than this are too noisy to estimate a growth exponent from
+MIN_SECONDS = 0.002
+
+
+def random_edges(n: int, degree: int, seed: int) -> []:
+    """
+    Return list of (u, v) pairs: a path through all n vertices plus random extra edges,
+    so every vertex is reachable from vertex 0
+    """
+    rng = random.Random(seed)
+    edges = [(index, index + 1) for index in range(n - 1)]
+    for _ in range(n * (degree - 1)):
+        edges.append((rng.randrange(n), rng.randrange(n)))
+    return edges
+
+
+def erdos_renyi_edges(n: int, degree: int, seed: int) -> []:
+    """
+    Return list of (u, v) pairs: n * degree / 2 edges between uniformly random vertex pairs
+    """
+    rng = random.Random(seed)
+    edges = list()
+    while len(edges) < n * degree // 2:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            edges.append((u, v))
+    return edges
+
+
+def grid_edges(n: int) -> []:
+    """
+    Return list of (u, v) pairs of a side x side grid with side = floor(sqrt(n)),
+    every edge pointing right or down
+    """
+    side = math.isqrt(n)
+    edges = list()
+    for row in range(side):
+        for col in range(side):
+            vertex = row * side + col
+            if col + 1 < side:
+                edges.append((vertex, vertex + 1))
+            if row + 1 < side:
+                edges.append((vertex, vertex + side))
+    return edges
+
+
+def power_law_edges(n: int, degree: int, seed: int) -> []:
+    """
+    Return list of (v, u) pairs grown by preferential attachment (Barabasi-Albert):
+    every new vertex u is linked from degree / 2 earlier vertices v picked in proportion to
+    their degree, so vertex 0 reaches the whole graph
+    """
+    rng = random.Random(seed)
+    links = max(1, degree // 2)
+    edges = list()
+    # every vertex appears here once per incident edge, so a uniform pick is degree-weighted
+    ends = list()
+    for u in range(1, n):
+        picked = set()
+        for _ in range(min(links, u)):
+            v = ends[rng.randrange(len(ends))] if len(ends) > 0 else 0
+            while v in picked:
+                v = rng.randrange(u)
+            picked.add(v)
+            edges.append((v, u))
+            ends.append(u)
+            ends.append(v)
+    return edges
+
+
+FAMILIES = {'erdos_renyi': lambda n, degree, seed: erdos_renyi_edges(n, degree, seed),
+            'grid': lambda n, degree, seed: grid_edges(n),
+            'power_law': lambda n, degree, seed: power_law_edges(n, degree, seed),
+            'path': lambda n, degree, seed: random_edges(n, degree, seed)}
+
+
+def time_call(func, *args) -> float:
+    """
+    Return wall time in seconds of a single call
+    """
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def directed_cases(graph_class, n: int, edges: [], seed: int) -> dict:
+    """
+    Return dict of operation name -> setup(); each setup() prepares a fresh graph and
+    returns the zero-argument call to measure
+    """
+    rng = random.Random(seed)
+    weighted = [(u, v, rng.randint(1, 10)) for u, v in edges]
+
+    def built():
+        graph = graph_class()
+        graph.add_vertices(n)
+        graph.add_edges(weighted)
+        return graph
+
+    def add_vertex():
+        graph = graph_class()
+        return lambda: [graph.add_vertex() for _ in range(n)]
+
+    def add_edge():
+        graph = graph_class()
+        graph.add_vertices(n)
+        return lambda: [graph.add_edge(u, v, w) for u, v, w in weighted]
+
+    def query(method, *args):
+        def setup():
+            graph = built()
+            return lambda: getattr(graph, method)(*args)
+        return setup
+
+    return {'add_vertex': add_vertex, 'add_edge': add_edge, 'get_edges': query('get_edges'),
+            'dfs': query('dfs', 0), 'bfs': query('bfs', 0), 'has_cycle': query('has_cycle'),
+            'count_connected_components': query('count_strongly_connected_components'),
+            'dijkstra': query('dijkstra', 0)}
+
+
+def undirected_cases(n: int, edges: [], seed: int) -> dict:
+    """
+    Return dict of operation name -> setup() for UndirectedGraph (vertex labels are strings)
+    """
+    labels = [str(vertex) for vertex in range(n)]
+    pairs = [(labels[u], labels[v]) for u, v in edges]
+
+    def add_vertex():
+        graph = UndirectedGraph()
+        return lambda: [graph.add_vertex(label) for label in labels]
+
+    def add_edge():
+        graph = UndirectedGraph()
+        return lambda: [graph.add_edge(u, v) for u, v in pairs]
+
+    def query(method, *args):
+        def setup():
+            graph = UndirectedGraph()
+            for label in labels:
+                graph.add_vertex(label)
+            graph.add_edges(pairs)
+            return lambda: getattr(graph, method)(*args)
+        return setup
+
+    return {'add_vertex': add_vertex, 'add_edge': add_edge, 'get_edges': query('get_edges'),
+            'dfs': query('dfs', '0'), 'bfs': query('bfs', '0'), 'has_cycle': query('has_cycle'),
+            'count_connected_components': query('count_connected_components')}
+
+
+def measure(setup, repeat: int, memory: bool) -> dict:
+    """
+    Return best wall time of repeat fresh runs and, if memory is set, the peak traced memory
+    of one more run (traced separately, since tracemalloc slows the timed runs down)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        call = setup()
+        best = min(best, time_call(call))
+        # a single slow run is already stable enough
+        if best > 1.0:
+            break
+
+    peak = None
+    if memory:
+        call = setup()
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run_suite(min_exp: int, max_exp: int, families: [], graphs: [], operations, degree: int,
+              seed: int, repeat=3, memory=True, progress=None) -> dict:
+    """
+    Return benchmark report: metadata and one result row per family, graph, operation and size
+    """
+    results = list()
+    for family in families:
+        for exp in range(min_exp, max_exp + 1):
+            n = 10 ** exp
+            edges = FAMILIES[family](n, degree, seed)
+            if family == 'grid':
+                n = math.isqrt(n) ** 2
+
+            cases = dict()
+            if 'csr' in graphs:
+                cases['csr'] = directed_cases(CSRDirectedGraph, n, edges, seed)
+            if 'dense' in graphs and n <= DENSE_LIMIT:
+                cases['dense'] = directed_cases(DirectedGraph, n, edges, seed)
+            if 'undirected' in graphs:
+                cases['undirected'] = undirected_cases(n, edges, seed)
+
+            for graph, setups in cases.items():
+                for operation, setup in setups.items():
+                    if operations and operation not in operations:
+                        continue
+                    row = {'family': family, 'graph': graph, 'operation': operation,
+                           'vertices': n, 'edges': len(edges)}
+                    row.update(measure(setup, repeat, memory))
+                    results.append(row)
+                    if progress is not None:
+                        progress(row)
+
+    _growth(results)
+    meta = {'python': platform.python_version(), 'platform': platform.platform(),
+            'degree': degree, 'seed': seed, 'repeat': repeat,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    return {'meta': meta, 'results': results}
+
+
+def _growth(results: []) -> None:
+    """
+    Add 'exponent' to every row: k in time ~ vertices^k, estimated from the next smaller
+    size of the same family, graph and operation (None when the timings are too short)
+    """
+    previous = dict()
+    for row in results:
+        key = (row['family'], row['graph'], row['operation'])
+        row['exponent'] = None
+        last = previous.get(key)
+        if last is not None and last['seconds'] >= MIN_SECONDS and row['vertices'] > last['vertices']:
+            row['exponent'] = (math.log(row['seconds'] / last['seconds'])
+                               / math.log(row['vertices'] / last['vertices']))
+        previous[key] = row
+
+
+def superlinear(report: dict, limit=SUPERLINEAR) -> []:
+    """
+    Return result rows whose time grows faster than vertices^limit
+    """
+    return [row for row in report['results']
+            if row['exponent'] is not None and row['exponent'] > limit]
+
+
+def compare(report: dict, baseline: dict, threshold=1.5) -> []:
+    """
+    Return list of (row, baseline row, time ratio, memory ratio) for every measurement present
+    in both reports that got slower or larger than threshold times the baseline
+    """
+    def key(row):
+        return row['family'], row['graph'], row['operation'], row['vertices']
+
+    old = {key(row): row for row in baseline['results']}
+    regressions = list()
+    for row in report['results']:
+        base = old.get(key(row))
+        if base is None or base['seconds'] < MIN_SECONDS:
+            continue
+        time_ratio = row['seconds'] / base['seconds']
+        memory_ratio = None
+        if row['peak_bytes'] and base['peak_bytes']:
+            memory_ratio = row['peak_bytes'] / base['peak_bytes']
+        if time_ratio > threshold or (memory_ratio is not None and memory_ratio > threshold):
+            regressions.append((row, base, time_ratio, memory_ratio))
+    return regressions
+
+
+def _print_row(row: dict) -> None:
+    """
+    Print one result row of the table
+    """
+    peak = '-' if row['peak_bytes'] is None else f"{row['peak_bytes'] / 2 ** 20:.2f}"
+    print(f"{row['family']:<12}{row['graph']:<12}{row['operation']:<28}{row['vertices']:>9}"
+          f"{row['seconds']:>11.4f}{row['seconds'] / row['vertices'] * 1e6:>11.3f}{peak:>10}")
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Time graph operations at growing sizes')
+    parser.add_argument('--min-exp', type=int, default=2, help='smallest graph has 10^min-exp vertices')
+    parser.add_argument('--max-exp', type=int, default=5, help='largest graph has 10^max-exp vertices')
+    parser.add_argument('--degree', type=int, default=4, help='average degree')
+    parser.add_argument('--seed', type=int, default=261)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per measurement, best is kept')
+    parser.add_argument('--family', action='append', choices=sorted(FAMILIES),
+                        help='graph family to run (default: all)')
+    parser.add_argument('--graph', action='append', choices=['csr', 'dense', 'undirected'],
+                        help='graph class to run (default: all)')
+    parser.add_argument('--operation', action='append', help='operation to run (default: all)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', help='write the report to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON report to check this run against')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='slowdown / memory growth ratio counted as a regression')
+    args = parser.parse_args()
+
+    print(f"{'family':<12}{'graph':<12}{'operation':<28}{'vertices':>9}"
+          f"{'seconds':>11}{'us/vertex':>11}{'peak MiB':>10}")
+    report = run_suite(args.min_exp, args.max_exp, args.family or sorted(FAMILIES),
+                       args.graph or ['csr', 'dense', 'undirected'], args.operation,
+                       args.degree, args.seed, args.repeat, not args.no_memory, _print_row)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+
+    failed = False
+    for row in superlinear(report):
+        print(f"superlinear: {row['family']} {row['graph']} {row['operation']} "
+              f"at {row['vertices']} vertices grows as n^{row['exponent']:.2f}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        for row, base, time_ratio, memory_ratio in compare(report, baseline, args.threshold):
+            failed = True
+            memory = '' if memory_ratio is None else f', memory x{memory_ratio:.2f}'
+            print(f"regression: {row['family']} {row['graph']} {row['operation']} "
+                  f"at {row['vertices']} vertices: time x{time_ratio:.2f}{memory}")
+        if not failed:
+            print(f'no regressions against {args.compare}')
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,320 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Contraction Hierarchies for point-to-point routing on a static DirectedGraph.
+# Preprocessing contracts vertices one at a time (least important first), adding a shortcut edge
+# wherever a shortest path ran through the contracted vertex. A query then runs two Dijkstra
+# searches that only climb to higher-ranked vertices, which settles a few hundred vertices instead
+# of a large part of the graph. The hierarchy is kept as CSR arrays (see snapshot.save_hierarchy).
+
+import heapq
+from array import array
+from bisect import bisect_left
+
+
+class ContractionHierarchy:
+    """
+    Class to answer shortest path queries on a preprocessed DirectedGraph
+    - build with ContractionHierarchy.build(graph) or graph.contraction_hierarchy()
+    - the graph must not change afterwards, the hierarchy is not updated
+    """
+
+    def __init__(self, rank, up, down):
+        """
+        Store vertex ranks and the two halves of the hierarchy; up and down are
+        (offsets, vertices, weights, middles) CSR arrays of
+        - up: edges v -> x to higher-ranked x, grouped by v
+        - down: edges x -> v from higher-ranked x, grouped by v
+        middles hold the vertex a shortcut skips, -1 for an edge of the original graph
+        """
+        self.v_count = len(rank)
+        self.rank = rank
+        self.up = up
+        self.down = down
+
+    @classmethod
+    def build(cls, graph, witness_limit=64):
+        """
+        Return hierarchy of graph; witness_limit caps the vertices settled by each witness
+        search (a capped search adds a shortcut that may not be needed, never a wrong one)
+        """
+        return _Builder(graph, witness_limit).run()
+
+    def distance(self, src: int, dst: int):
+        """
+        Return length of the shortest path from src to dst, inf if there is none
+        """
+        return self._search(src, dst)[0]
+
+    def shortest_path(self, src: int, dst: int) -> []:
+        """
+        Return list of vertices on the shortest path from src to dst (shortcuts unpacked),
+        empty list if there is none
+        """
+        length, meet, parents = self._search(src, dst)
+        if meet is None:
+            return list()
+
+        # hierarchy edges from src up to meet, then from meet down to dst
+        hops = list()
+        vertex = meet
+        while parents[0][vertex] is not None:
+            hops.append((parents[0][vertex], vertex))
+            vertex = parents[0][vertex]
+        hops.reverse()
+        vertex = meet
+        while parents[1][vertex] is not None:
+            hops.append((vertex, parents[1][vertex]))
+            vertex = parents[1][vertex]
+
+        path = [src]
+        for tail, head in hops:
+            self._unpack(tail, head, path)
+        return path
+
+    def shortcut_count(self) -> int:
+        """
+        Return number of shortcut edges the preprocessing added
+        """
+        return sum(1 for middle in self.up[3] if middle >= 0) + \
+            sum(1 for middle in self.down[3] if middle >= 0)
+
+    # ------------------------------------------------------------------ #
+
+    def _search(self, src: int, dst: int):
+        """
+        Return (length, meeting vertex, (forward parents, backward parents)) of a
+        bidirectional upward search, meeting vertex None if dst is not reachable
+        """
+        inf = float('inf')
+        if not (0 <= src < self.v_count and 0 <= dst < self.v_count):
+            return inf, None, None
+
+        # index 0: upward search from src, index 1: upward search over reversed edges from dst
+        best = ({src: 0}, {dst: 0})
+        parents = ({src: None}, {dst: None})
+        queues = ([(0, src)], [(0, dst)])
+        halves = (self.up, self.down)
+
+        shortest = inf
+        meet = None
+        while True:
+            top_up = queues[0][0][0] if queues[0] else inf
+            top_down = queues[1][0][0] if queues[1] else inf
+            # neither search can reach a better meeting vertex any more
+            if top_up >= shortest and top_down >= shortest:
+                break
+
+            side = 0 if top_up <= top_down else 1
+            own = best[side]
+            queue = queues[side]
+            v_len, vertex = heapq.heappop(queue)
+            if v_len > own[vertex]:
+                continue
+            other = best[1 - side].get(vertex)
+            if other is not None and v_len + other < shortest:
+                shortest = v_len + other
+                meet = vertex
+
+            offsets, vertices, weights, _ = halves[side]
+            start, end = offsets[vertex], offsets[vertex + 1]
+            parent = parents[side]
+            for successor, weight in zip(vertices[start:end], weights[start:end]):
+                new_len = v_len + weight
+                if new_len < own.get(successor, inf):
+                    own[successor] = new_len
+                    parent[successor] = vertex
+                    heapq.heappush(queue, (new_len, successor))
+
+        return shortest, meet, parents
+
+    def _middle(self, tail: int, head: int) -> int:
+        """
+        Return vertex skipped by hierarchy edge tail -> head, -1 if it is an original edge
+        """
+        if self.rank[tail] < self.rank[head]:
+            offsets, vertices, _, middles = self.up
+            vertex, other = tail, head
+        else:
+            offsets, vertices, _, middles = self.down
+            vertex, other = head, tail
+        index = bisect_left(vertices, other, offsets[vertex], offsets[vertex + 1])
+        return middles[index]
+
+    def _unpack(self, tail: int, head: int, path: []) -> None:
+        """
+        Append the original vertices of hierarchy edge tail -> head (after tail) to path
+        """
+        stack = [(tail, head)]
+        while len(stack) > 0:
+            tail, head = stack.pop()
+            middle = self._middle(tail, head)
+            if middle < 0:
+                path.append(head)
+            else:
+                # tail -> middle comes first, so it is pushed last
+                stack.append((middle, head))
+                stack.append((tail, middle))
+
+
+class _Builder:
+    """
+    Contracts the vertices of a graph in order of importance, adding shortcut edges
+    """
+
+    def __init__(self, graph, witness_limit: int):
+        """
+        Copy graph into per-vertex dicts of neighbour -> (weight, middle)
+        """
+        self.witness_limit = witness_limit
+        size = graph.v_count
+        self.out = [dict() for _ in range(size)]
+        self.inn = [dict() for _ in range(size)]
+        self.floats = False
+        for src in range(size):
+            for dst, weight in graph._neighbors(src):
+                self.out[src][dst] = (weight, -1)
+                self.inn[dst][src] = (weight, -1)
+                if not isinstance(weight, int):
+                    self.floats = True
+        self.rank = array('i', [-1]) * size
+        self.contracted_neighbors = [0] * size
+        self.depth = [0] * size
+        # up / down edges of every vertex, fixed when the vertex is contracted
+        self.up = [None] * size
+        self.down = [None] * size
+
+    def run(self) -> ContractionHierarchy:
+        """
+        Contract every vertex and return the hierarchy
+        """
+        # lazy updates: a popped vertex whose priority grew is pushed back instead
+        priority_q = [(self._priority(vertex), vertex) for vertex in range(len(self.out))]
+        heapq.heapify(priority_q)
+        order = 0
+        while len(priority_q) > 0:
+            _, vertex = heapq.heappop(priority_q)
+            priority = self._priority(vertex)
+            if len(priority_q) > 0 and priority > priority_q[0][0]:
+                heapq.heappush(priority_q, (priority, vertex))
+                continue
+            self._contract(vertex)
+            self.rank[vertex] = order
+            order += 1
+
+        code = 'd' if self.floats else 'q'
+        return ContractionHierarchy(self.rank, _pack(self.up, code), _pack(self.down, code))
+
+    def _priority(self, vertex: int) -> int:
+        """
+        Return importance of vertex, lower is contracted first: twice the edge difference
+        (shortcuts added - edges removed) plus contracted neighbours plus hierarchy depth,
+        so contraction spreads evenly over the graph
+        """
+        shortcuts = len(self._shortcuts(vertex))
+        removed = len(self.out[vertex]) + len(self.inn[vertex])
+        return (2 * (shortcuts - removed) + self.contracted_neighbors[vertex]
+                + self.depth[vertex])
+
+    def _contract(self, vertex: int) -> None:
+        """
+        Remove vertex from the remaining graph, keeping its edges as hierarchy edges and
+        adding shortcuts for the shortest paths through it
+        """
+        shortcuts = self._shortcuts(vertex)
+        self.up[vertex] = sorted((dst, weight, middle)
+                                 for dst, (weight, middle) in self.out[vertex].items())
+        self.down[vertex] = sorted((src, weight, middle)
+                                   for src, (weight, middle) in self.inn[vertex].items())
+
+        depth = self.depth[vertex] + 1
+        for dst in self.out[vertex]:
+            del self.inn[dst][vertex]
+            self.contracted_neighbors[dst] += 1
+            self.depth[dst] = max(self.depth[dst], depth)
+        for src in self.inn[vertex]:
+            del self.out[src][vertex]
+            self.contracted_neighbors[src] += 1
+            self.depth[src] = max(self.depth[src], depth)
+        self.out[vertex] = dict()
+        self.inn[vertex] = dict()
+
+        for src, dst, weight in shortcuts:
+            self.out[src][dst] = (weight, vertex)
+            self.inn[dst][src] = (weight, vertex)
+
+    def _shortcuts(self, vertex: int) -> []:
+        """
+        Return list of (src, dst, weight) shortcuts contracting vertex would need:
+        src -> vertex -> dst paths with no witness path of equal or shorter length
+        """
+        shortcuts = list()
+        outgoing = self.out[vertex]
+        if len(outgoing) == 0:
+            return shortcuts
+        longest_out = max(weight for weight, _ in outgoing.values())
+
+        for src, (in_weight, _) in self.inn[vertex].items():
+            witness = self._witness_search(src, vertex, in_weight + longest_out)
+            for dst, (out_weight, _) in outgoing.items():
+                if dst == src:
+                    continue
+                via = in_weight + out_weight
+                if witness.get(dst, float('inf')) > via:
+                    shortcuts.append((src, dst, via))
+        return shortcuts
+
+    def _witness_search(self, src: int, skip: int, limit) -> dict:
+        """
+        Return distances from src found by a Dijkstra that avoids skip, stops beyond limit
+        and settles at most witness_limit vertices
+        """
+        distance = {src: 0}
+        settled = 0
+        priority_q = [(0, src)]
+        while len(priority_q) > 0 and settled < self.witness_limit:
+            v_len, vertex = heapq.heappop(priority_q)
+            if v_len > distance[vertex]:
+                continue
+            if v_len > limit:
+                break
+            settled += 1
+            for successor, (weight, _) in self.out[vertex].items():
+                new_len = v_len + weight
+                if successor != skip and new_len < distance.get(successor, float('inf')):
+                    distance[successor] = new_len
+                    heapq.heappush(priority_q, (new_len, successor))
+        return distance
+
+
+def _pack(edges: [], code: str):
+    """
+    Return (offsets, vertices, weights, middles) CSR arrays of per-vertex sorted edge lists
+    """
+    offsets = array('q', [0])
+    vertices = array('i')
+    weights = array(code)
+    middles = array('i')
+    for row in edges:
+        for vertex, weight, middle in row:
+            vertices.append(vertex)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(vertices))
+    return offsets, vertices, weights, middles
+
+
+if __name__ == '__main__':
+
+    from d_graph import DirectedGraph
+
+    print("\nPDF - ContractionHierarchy example 1")
+    print("------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    ch = ContractionHierarchy.build(g)
+    print(list(ch.rank), ch.shortcut_count())
+    for i in range(5):
+        print(f'CH {i} {[ch.distance(i, j) for j in range(5)]} DIJKSTRA {g.dijkstra(i)}')
+    print(ch.shortest_path(0, 2), g.shortest_path(0, 2))
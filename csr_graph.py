@@ -0,0 +1,452 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: A directed-weighted graph stored in compressed-sparse-row (CSR) form. It keeps the
+# public methods of DirectedGraph, but memory scales with the number of edges instead of V^2 and
+# every traversal only touches the out-edges of the vertices it visits.
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from d_graph import DirectedGraph
+
+# edited rows are merged back into the arrays once there are more than
+# max(COMPACT_ROWS, v_count // 8) of them
+COMPACT_ROWS = 1024
+
+
+class CSRDirectedGraph(DirectedGraph):
+    """
+    Class to implement directed weighted graph on a CSR store
+    - out-edges of vertex v are targets[offsets[v]:offsets[v + 1]], sorted by target
+    - weights[i] is the weight of the edge to targets[i]
+    - an edit rewrites a copy of the edited row only (in place for a re-weight); the copies
+      are merged back into the arrays once many rows are edited
+    - the arrays may also be read-only memoryviews (see snapshot.py)
+    """
+
+    def __init__(self, start_edges=None):
+        """
+        Store graph info as CSR arrays
+        """
+        self.v_count = 0
+        self._offsets = array('q', [0])
+        self._targets = array('i')
+        self._weights = array('q')
+        # edited rows: vertex -> (targets, weights) replacing its slice of the arrays
+        self._pending = dict()
+        # reversed graph (built on first use) and its edited rows
+        self._reverse = None
+        self._pending_in = dict()
+
+        # populate graph with initial vertices and edges (if provided)
+        if start_edges is not None:
+            v_count = 0
+            for u, v, _ in start_edges:
+                v_count = max(v_count, u, v)
+            self._build(v_count + 1, start_edges)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """
+        Return new graph built in bulk from (src, dst, weight) edges,
+        sized to the largest vertex seen
+        """
+        graph = cls()
+        graph._load(None, edges)
+        return graph
+
+    @property
+    def adj_matrix(self):
+        """
+        Return read-only dense adjacency matrix view of the graph (for printing small graphs),
+        a row is built when it is looked up
+        """
+        return _MatrixView(self)
+
+    # ------------------------------------------------------------------ #
+
+    def add_vertices(self, count: int) -> int:
+        """
+        Add count new vertices to the graph, return new number of vertices
+        """
+        if count <= 0:
+            return self.v_count
+
+        # offsets may be a read-only view (e.g. a mapped snapshot), copy it before growing
+        if not isinstance(self._offsets, array):
+            self._offsets = array('q', self._offsets)
+
+        # new vertices have no out-edges, so their offsets repeat the last one
+        self._offsets.extend(array('q', [self._offsets[-1]]) * count)
+        if self._reverse is not None:
+            offsets = self._reverse[0]
+            offsets.extend(array('q', [offsets[-1]]) * count)
+        self.v_count += count
+        self._version += 1
+
+        return self.v_count
+
+    def add_edge(self, src: int, dst: int, weight=1) -> None:
+        """
+        Add edges to the graph
+        """
+        size = self.v_count - 1
+        if src > size or dst > size:
+            return
+        if src < 0 or dst < 0:
+            return
+        if src == dst:
+            return
+        if weight < 0:
+            return
+
+        self._set(src, dst, weight)
+        self._version += 1
+
+    def add_edges(self, edges) -> None:
+        """
+        Add (src, dst, weight) edges to the graph in bulk, skipping invalid ones like add_edge
+        """
+        self._load(self.v_count, edges)
+        self._version += 1
+
+    def remove_edge(self, src: int, dst: int) -> None:
+        """
+        Remove edge from the graph
+        """
+        size = self.v_count - 1
+        if src > size or dst > size:
+            return
+        if src < 0 or dst < 0:
+            return
+        if src == dst:
+            return
+
+        if self._weight(src, dst) == 0:
+            return
+        else:
+            self._set(src, dst, 0)
+            self._version += 1
+
+    # ------------------------------------------------------------------ #
+
+    def _neighbors(self, v: int) -> []:
+        """
+        Return list of (dst, weight) pairs for the out-edges of v,
+        in ascending order of dst
+        """
+        targets, weights, start, end = self._row(v)
+        return list(zip(targets[start:end], weights[start:end]))
+
+    def _in_neighbors(self, v: int) -> []:
+        """
+        Return list of (src, weight) pairs for the in-edges of v,
+        in ascending order of src
+        """
+        if self._reverse is None:
+            self._reverse = self._transpose()
+        row = self._pending_in.get(v)
+        if row is not None:
+            return list(zip(*row))
+        offsets, sources, weights = self._reverse
+        start = offsets[v]
+        end = offsets[v + 1]
+        return list(zip(sources[start:end], weights[start:end]))
+
+    def _row(self, v: int):
+        """
+        Return (targets, weights, start, end), the out-edges of v being targets[start:end]
+        """
+        row = self._pending.get(v)
+        if row is not None:
+            return row[0], row[1], 0, len(row[0])
+        return self._targets, self._weights, self._offsets[v], self._offsets[v + 1]
+
+    def _transpose(self):
+        """
+        Return (offsets, sources, weights) CSR arrays of the reversed graph
+        """
+        size = self.v_count
+        code = _typecode(self._weights)
+        count = 0
+        offsets = array('q', bytes(8 * (size + 1)))
+        for src in range(size):
+            targets, weights, start, end = self._row(src)
+            for dst in targets[start:end]:
+                offsets[dst + 1] += 1
+            count += end - start
+            if _typecode(weights) == 'd':
+                code = 'd'
+        for index in range(size):
+            offsets[index + 1] += offsets[index]
+
+        # rows are walked in src order, so every reversed row comes out sorted
+        position = array('q', offsets)
+        sources = array('i', bytes(4 * count))
+        reversed_weights = array(code, bytes(count * array(code).itemsize))
+        for src in range(size):
+            targets, weights, start, end = self._row(src)
+            for dst, weight in zip(targets[start:end], weights[start:end]):
+                sources[position[dst]] = src
+                reversed_weights[position[dst]] = weight
+                position[dst] += 1
+
+        return offsets, sources, reversed_weights
+
+    def _set(self, src: int, dst: int, weight) -> None:
+        """
+        Store weight of edge src -> dst (0 removes it) in its row and, if built, in the
+        reversed arrays; merges the edited rows once there are too many of them
+        """
+        _set_weight(self._pending, src, dst, weight, self._offsets, self._targets, self._weights)
+        if self._reverse is not None:
+            _set_weight(self._pending_in, dst, src, weight, *self._reverse)
+        if len(self._pending) + len(self._pending_in) > max(COMPACT_ROWS, self.v_count // 8):
+            self._compact()
+
+    def _weight(self, src: int, dst: int):
+        """
+        Return weight of edge src -> dst, 0 if there is no such edge
+        """
+        targets, weights, start, end = self._row(src)
+        index = bisect_left(targets, dst, start, end)
+        if index < end and targets[index] == dst:
+            return weights[index]
+        return 0
+
+    def _build(self, v_count, edges) -> None:
+        """
+        Replace the graph with the given (src, dst, weight) edges and v_count vertices
+        (None: grow to the largest vertex seen), later duplicates overwrite earlier ones
+        """
+        self._pending = dict()
+        self._reverse = None
+        self._pending_in = dict()
+        self.v_count = 0
+        self._offsets = array('q', [0])
+        self._targets = array('i')
+        self._weights = array('q')
+        self._load(v_count, edges)
+
+    def _load(self, v_count, edges) -> None:
+        """
+        Merge the given (src, dst, weight) edges into the graph with a single validation
+        pass over compact arrays and one counting sort, instead of one add_edge call per edge
+        """
+        sources, targets, weights = self._edge_arrays()
+
+        grow = v_count is None
+        last = self.v_count - 1 if grow else v_count - 1
+        for src, dst, weight in edges:
+            if src < 0 or dst < 0:
+                continue
+            if grow:
+                if src > last:
+                    last = src
+                if dst > last:
+                    last = dst
+            elif src > last or dst > last:
+                continue
+            if src == dst or weight < 0:
+                continue
+            if weights.typecode == 'q' and not isinstance(weight, int):
+                weights = array('d', weights)
+            sources.append(src)
+            targets.append(dst)
+            weights.append(weight)
+
+        self.v_count = max(self.v_count, last + 1)
+        self._fill(sources, targets, weights)
+
+    def _edge_arrays(self):
+        """
+        Return (sources, targets, weights) arrays holding a copy of every stored edge,
+        edited rows included
+        """
+        if self._pending:
+            self._compact()
+        sources = array('i')
+        for src in range(self.v_count):
+            sources.extend(array('i', [src]) * (self._offsets[src + 1] - self._offsets[src]))
+        return sources, array('i', self._targets), array(_typecode(self._weights), self._weights)
+
+    def _fill(self, sources, targets, weights) -> None:
+        """
+        Rebuild the CSR arrays from parallel edge arrays in insertion order:
+        counting sort on src, then a stable sort on dst inside each row
+        (the last duplicate wins and a zero weight removes the edge)
+        """
+        size = self.v_count
+        offsets = array('q', bytes(8 * (size + 1)))
+        for src in sources:
+            offsets[src + 1] += 1
+        for index in range(size):
+            offsets[index + 1] += offsets[index]
+
+        position = array('q', offsets)
+        order = array('q', bytes(8 * len(sources)))
+        for index, src in enumerate(sources):
+            order[position[src]] = index
+            position[src] += 1
+
+        new_offsets = array('q', [0])
+        new_targets = array('i')
+        new_weights = array(weights.typecode)
+        for src in range(size):
+            row = sorted(order[offsets[src]:offsets[src + 1]], key=targets.__getitem__)
+            for pos, index in enumerate(row):
+                dst = targets[index]
+                if pos + 1 < len(row) and targets[row[pos + 1]] == dst:
+                    continue
+                if weights[index] > 0:
+                    new_targets.append(dst)
+                    new_weights.append(weights[index])
+            new_offsets.append(len(new_targets))
+
+        self._offsets = new_offsets
+        self._targets = new_targets
+        self._weights = new_weights
+        self._reverse = None
+
+    def _compact(self) -> None:
+        """
+        Merge the edited rows back into the CSR arrays (and the reversed arrays, if built)
+        """
+        size = self.v_count
+        self._offsets, self._targets, self._weights = _splice(
+            self._offsets, self._targets, self._weights, self._pending, size)
+        self._pending = dict()
+        if self._reverse is not None:
+            self._reverse = _splice(*self._reverse, self._pending_in, size)
+        self._pending_in = dict()
+
+
+class _MatrixView(Sequence):
+    """
+    Read-only view of a CSRDirectedGraph as a list of dense rows, built per lookup
+    """
+
+    def __init__(self, graph: CSRDirectedGraph):
+        self.graph = graph
+
+    def __getitem__(self, src):
+        if isinstance(src, slice):
+            return [self[index] for index in range(*src.indices(len(self)))]
+        if src < 0:
+            src += len(self)
+        if not 0 <= src < len(self):
+            raise IndexError('adjacency matrix row out of range')
+        row = [0] * self.graph.v_count
+        for dst, weight in self.graph._neighbors(src):
+            row[dst] = weight
+        return row
+
+    def __len__(self):
+        return self.graph.v_count
+
+
+def _typecode(buffer) -> str:
+    """
+    Return item typecode of an array or of a typed memoryview
+    """
+    if isinstance(buffer, array):
+        return buffer.typecode
+    return buffer.format
+
+
+def _append(buffer, block) -> None:
+    """
+    Append the items of an array or typed memoryview to array buffer
+    """
+    if _typecode(block) == buffer.typecode:
+        buffer.frombytes(block.tobytes())
+    else:
+        buffer.extend(block.tolist())
+
+
+def _set_weight(rows: dict, v: int, other: int, weight, offsets, items, weights) -> None:
+    """
+    Set weight of the entry for other in row v of CSR arrays offsets / items / weights
+    (0 removes it); rows holds the edited copies of rows, v's row is copied on its first edit
+    """
+    row = rows.get(v)
+    if row is None:
+        start = offsets[v]
+        end = offsets[v + 1]
+        index = bisect_left(items, other, start, end)
+        found = index < end and items[index] == other
+        # re-weighting a stored entry is done in place, if the arrays are writable and typed for it
+        if found and weight != 0 and isinstance(weights, array) \
+                and (weights.typecode == 'd' or isinstance(weight, int)):
+            weights[index] = weight
+            return
+        if not found and weight == 0:
+            return
+        row = (array('i', items[start:end]), array(_typecode(weights), weights[start:end]))
+
+    if row[1].typecode == 'q' and not isinstance(weight, int):
+        row = (row[0], array('d', row[1].tolist()))
+    row_items, row_weights = row
+    index = bisect_left(row_items, other)
+    if index < len(row_items) and row_items[index] == other:
+        if weight == 0:
+            del row_items[index]
+            del row_weights[index]
+        else:
+            row_weights[index] = weight
+    elif weight != 0:
+        row_items.insert(index, other)
+        row_weights.insert(index, weight)
+    rows[v] = row
+
+
+def _splice(offsets, items, weights, rows: dict, size: int):
+    """
+    Return (offsets, items, weights) CSR arrays of size rows with the edited rows in rows
+    replacing their slices; the rows in between are copied as whole blocks
+    """
+    code = _typecode(weights)
+    if any(row_weights.typecode == 'd' for _, row_weights in rows.values()):
+        code = 'd'
+    new_offsets = array('q', [0])
+    new_items = array('i')
+    new_weights = array(code)
+
+    shift = 0
+    first = 0
+    for v in sorted(rows) + [size]:
+        start = offsets[first]
+        end = offsets[v]
+        _append(new_items, items[start:end])
+        _append(new_weights, weights[start:end])
+        new_offsets.extend(offset + shift for offset in offsets[first + 1:v + 1])
+        if v == size:
+            break
+        row_items, row_weights = rows[v]
+        _append(new_items, row_items)
+        _append(new_weights, row_weights)
+        shift += len(row_items) - (offsets[v + 1] - offsets[v])
+        new_offsets.append(offsets[v + 1] + shift)
+        first = v + 1
+
+    return new_offsets, new_items, new_weights
+
+
+if __name__ == '__main__':
+
+    print("\nPDF - CSR backend matches dense DirectedGraph")
+    print("---------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    dense = DirectedGraph(edges)
+    g = CSRDirectedGraph(edges)
+    print(g)
+    print(g.get_edges() == dense.get_edges(), g.get_vertices())
+    for start in range(5):
+        print(f'{start} DFS:{g.dfs(start)} BFS:{g.bfs(start)} DIJKSTRA:{g.dijkstra(start)}')
+
+    g.remove_edge(4, 3)
+    g.add_edge(0, 2, 4)
+    print(g.get_edges(), g.has_cycle(), sep='\n')
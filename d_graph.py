@@ -8,6 +8,9 @@
 import heapq
 from collections import deque
 
+from profiling import Profiler, profiled
+from query_cache import QueryCache, cached_query
+
 
 class DirectedGraph:
     """
@@ -18,6 +21,18 @@ class DirectedGraph:
     - vertex names are integers
     """
 
+    # bumped by every edit, so cached query results of an older graph are never served
+    _version = 0
+
+    # optional LRU cache of query results, see enable_query_cache()
+    _query_cache = None
+
+    # optional Profiler collecting per-call stats, see enable_profiling()
+    _profiler = None
+
+    # neighbour hooks the profiler counts through, each returning (vertex, weight) pairs
+    _expansion_hooks = (('_neighbors', True), ('_in_neighbors', True))
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency matrix
@@ -60,11 +75,23 @@ class DirectedGraph:
         """
         Add new vertex to the graph
         """
-        self.v_count += 1
-        self.adj_matrix.append(list())
+        return self.add_vertices(1)
+
+    def add_vertices(self, count: int) -> int:
+        """
+        Add count new vertices to the graph, return new number of vertices
+        """
+        if count <= 0:
+            return self.v_count
+
+        # widen every row with one C-level extend instead of appending zeros one by one
+        padding = [0] * count
         for lst in self.adj_matrix:
-            while len(lst) < self.v_count:
-                lst.append(0)
+            lst.extend(padding)
+        self.v_count += count
+        for _ in range(count):
+            self.adj_matrix.append([0] * self.v_count)
+        self._version += 1
 
         return self.v_count
 
@@ -83,6 +110,18 @@ class DirectedGraph:
             return
 
         self.adj_matrix[src][dst] = weight
+        self._version += 1
+
+    def add_edges(self, edges) -> None:
+        """
+        Add (src, dst, weight) edges to the graph in bulk, skipping invalid ones like add_edge
+        """
+        size = self.v_count
+        matrix = self.adj_matrix
+        for src, dst, weight in edges:
+            if 0 <= src < size and 0 <= dst < size and src != dst and weight >= 0:
+                matrix[src][dst] = weight
+        self._version += 1
 
     def remove_edge(self, src: int, dst: int) -> None:
         """
@@ -100,32 +139,51 @@ class DirectedGraph:
             return
         else:
             self.adj_matrix[src][dst] = 0
+            self._version += 1
+
+    def enable_query_cache(self, maxsize=128) -> QueryCache:
+        """
+        Cache results of dfs, bfs, dijkstra, dag_paths and shortest_path (at most maxsize of them)
+        and return the cache, whose stats() report hit rate and memory footprint
+        """
+        self._query_cache = QueryCache(maxsize)
+        return self._query_cache
+
+    def disable_query_cache(self) -> None:
+        """
+        Stop caching query results
+        """
+        self._query_cache = None
+
+    def enable_profiling(self, profiler=None, callback=None) -> Profiler:
+        """
+        Record stats of every call to dfs, bfs, has_cycle, strongly_connected_components,
+        topological_order, dag_paths, dijkstra, shortest_path and astar
+        on profiler (a new one reporting to callback if not given) and return it
+        """
+        self._profiler = profiler if profiler is not None else Profiler(callback)
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        """
+        Stop recording query stats
+        """
+        self._profiler = None
 
     def get_vertices(self) -> []:
         """
         Return list of vertices in the graph (any order)
         """
-        count = 0
-        lst_vertices = list()
-        for lst in self.adj_matrix:
-            lst_vertices.append(count)
-            count += 1
-
-        return lst_vertices
+        return list(range(self.v_count))
 
     def get_edges(self) -> []:
         """
         Return list of edges in the graph (any order)
         """
         lst_edges = list()
-        row = 0
-        for lst in self.adj_matrix:
-            row += 1
-            column = 0
-            for vertex in lst:
-                column += 1
-                if vertex != 0:
-                    lst_edges.append((row - 1, column - 1, vertex))
+        for src in range(self.v_count):
+            for dst, weight in self._neighbors(src):
+                lst_edges.append((src, dst, weight))
         return lst_edges
 
     def is_valid_path(self, path: []) -> bool:
@@ -140,141 +198,507 @@ class DirectedGraph:
         while index < size:
             src = path[index]
             dst = path[index + 1]
-            if self.adj_matrix[src][dst] > 0:
+            if self._weight(src, dst) > 0:
                 if dst == path[-1]:
                     return True
                 index += 1
             else:
                 return False
 
+    @profiled
+    @cached_query
     def dfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during DFS search
         Vertices are picked in alphabetical order
         """
-        last = len(self.adj_matrix) - 1
-        if v_start > last:
-            return list()
+        return list(self.iter_dfs(v_start, v_end))
 
-        visited = list()
+    @profiled
+    @cached_query
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Return list of vertices visited during BFS search
+        Vertices are picked in alphabetical order
+        """
+        return list(self.iter_bfs(v_start, v_end))
+
+    def iter_dfs(self, v_start, v_end=None, with_info=False):
+        """
+        Yield vertices in the order dfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
+        """
+        last = self.v_count - 1
+        if v_start < 0 or v_start > last:
+            return
+
+        # bitmap of visited vertices
+        seen = bytearray(self.v_count)
         stack = deque(list())
-        stack.append(v_start)
+        stack.append((v_start, 0, None))
         while len(stack) > 0:
-            pick = stack.pop()
-            if pick not in visited:
-                visited.append(pick)
+            pick, depth, parent = stack.pop()
+            if not seen[pick]:
+                seen[pick] = 1
+                yield (pick, depth, parent) if with_info else pick
                 if pick == v_end:
-                    return visited
-
-                index = -1
-                matrix = self.adj_matrix
-                while (index + len(matrix)) >= 0:
-                    if matrix[pick][index] > 0:
-                        stack.append(len(matrix) + index)
-                    index -= 1
+                    return
 
-        return visited
+                # push successors in descending order (thus pop in ascending order)
+                for dst, _ in reversed(self._neighbors(pick)):
+                    if not seen[dst]:
+                        stack.append((dst, depth + 1, pick))
 
-    def bfs(self, v_start, v_end=None) -> []:
+    def iter_bfs(self, v_start, v_end=None, with_info=False):
         """
-        Return list of vertices visited during BFS search
-        Vertices are picked in alphabetical order
+        Yield vertices in the order bfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
         """
-        last = len(self.adj_matrix) - 1
-        if v_start > last:
-            return list()
+        last = self.v_count - 1
+        if v_start < 0 or v_start > last:
+            return
 
-        visited = list()
+        # bitmap of vertices already visited or waiting in the queue
+        seen = bytearray(self.v_count)
+        seen[v_start] = 1
         queue = deque(list())
-        queue.append(v_start)
+        queue.append((v_start, 0, None))
         while len(queue) > 0:
-            pick = queue.popleft()
-            visited.append(pick)
+            pick, depth, parent = queue.popleft()
+            yield (pick, depth, parent) if with_info else pick
             if pick == v_end:
-                return visited
-
-            index = 0
-            matrix = self.adj_matrix
-            while index < len(matrix):
-                if matrix[pick][index] > 0:
-                    if index not in visited:
-                        if index not in queue:
-                            queue.append(index)
-                index += 1
+                return
 
-        return visited
+            for dst, _ in self._neighbors(pick):
+                if not seen[dst]:
+                    seen[dst] = 1
+                    queue.append((dst, depth + 1, pick))
 
-    def has_cycle(self):
+    @profiled
+    def has_cycle(self, return_cycle=False):
         """
         Return True if graph contains a cycle, False otherwise
+        If return_cycle is True, return the cycle found as a closed path
+        [v, ..., v] instead (empty list if there is none)
         """
-        row_index = 0
-        size = len(self.adj_matrix)
-        while row_index < size:
+        # white / grey (on the DFS path) / black (finished)
+        white, grey, black = 0, 1, 2
+        colour = bytearray(self.v_count)
 
-            visited = list()
-            stack = deque(list())
-            first = row_index
-            excluded_first = False
-            stack.append(first)
+        for root in range(self.v_count):
+            if colour[root] != white:
+                continue
+
+            colour[root] = grey
+            path = [root]
+            stack = [iter(self._neighbors(root))]
             while len(stack) > 0:
-                pick = stack.pop()
-                if pick not in visited:
-                    visited.append(pick)
-                    # excluding first from visited list
-                    if excluded_first is False:
-                        visited.remove(pick)
-                        excluded_first = True
-                    elif pick == first:
+                for dst, _ in stack[-1]:
+                    if colour[dst] == white:
+                        colour[dst] = grey
+                        path.append(dst)
+                        stack.append(iter(self._neighbors(dst)))
+                        break
+                    if colour[dst] == grey:
+                        # back edge closes a cycle along the current path
+                        if return_cycle:
+                            return path[path.index(dst):] + [dst]
                         return True
+                else:
+                    colour[path.pop()] = black
+                    stack.pop()
+
+        if return_cycle:
+            return list()
+        return False
 
-                    index = -1
-                    matrix = self.adj_matrix
-                    while (index + size) >= 0:
-                        if matrix[pick][index] > 0:
-                            stack.append(size + index)
-                        index -= 1
+    @profiled
+    def strongly_connected_components(self) -> []:
+        """
+        Return list of component labels, one per vertex, found by an iterative Tarjan
+        search in O(V+E); labels are numbered in topological order of the condensation
+        """
+        size = self.v_count
+        index = [-1] * size
+        low = [0] * size
+        on_stack = bytearray(size)
+        stack = list()
+        labels = [-1] * size
+        counter = 0
+        count = 0
 
-            row_index += 1
+        for root in range(size):
+            if index[root] != -1:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # explicit call stack of (vertex, remaining successors) instead of recursion
+            work = [(root, iter(self._neighbors(root)))]
+            while len(work) > 0:
+                vertex, successors = work[-1]
+                for dst, _ in successors:
+                    if index[dst] == -1:
+                        index[dst] = low[dst] = counter
+                        counter += 1
+                        stack.append(dst)
+                        on_stack[dst] = 1
+                        work.append((dst, iter(self._neighbors(dst))))
+                        break
+                    if on_stack[dst] and index[dst] < low[vertex]:
+                        low[vertex] = index[dst]
+                else:
+                    work.pop()
+                    if len(work) > 0:
+                        parent = work[-1][0]
+                        if low[vertex] < low[parent]:
+                            low[parent] = low[vertex]
+                    # vertex is the root of a component: pop it off the stack
+                    if low[vertex] == index[vertex]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            labels[member] = count
+                            if member == vertex:
+                                break
+                        count += 1
+
+        # Tarjan completes sink components first, reverse so edges go to higher labels
+        return [count - 1 - label for label in labels]
+
+    def count_strongly_connected_components(self) -> int:
+        """
+        Return number of strongly connected components in the graph
+        """
+        return len(set(self.strongly_connected_components()))
 
-        return False
+    def condensation(self):
+        """
+        Return (labels, dag): the component label of every vertex and a graph of the same
+        class with one vertex per component, whose edge weights are the lightest edge
+        between the two components
+        """
+        labels = self.strongly_connected_components()
+        lightest = dict()
+        for src in range(self.v_count):
+            for dst, weight in self._neighbors(src):
+                key = (labels[src], labels[dst])
+                if key[0] != key[1] and weight < lightest.get(key, float('inf')):
+                    lightest[key] = weight
+
+        dag = type(self)()
+        dag.add_vertices(len(set(labels)))
+        dag.add_edges((src, dst, weight) for (src, dst), weight in lightest.items())
+        return labels, dag
+
+    @profiled
+    def topological_order(self):
+        """
+        Return list of vertices in topological order (Kahn's algorithm),
+        None if the graph has a cycle
+        """
+        in_degree = [0] * self.v_count
+        for src in range(self.v_count):
+            for dst, _ in self._neighbors(src):
+                in_degree[dst] += 1
+
+        queue = deque(vertex for vertex in range(self.v_count) if in_degree[vertex] == 0)
+        order = list()
+        while len(queue) > 0:
+            vertex = queue.popleft()
+            order.append(vertex)
+            for dst, _ in self._neighbors(vertex):
+                in_degree[dst] -= 1
+                if in_degree[dst] == 0:
+                    queue.append(dst)
+
+        if len(order) < self.v_count:
+            return None
+        return order
+
+    @profiled
+    @cached_query
+    def dag_paths(self, src: int, longest=False):
+        """
+        Return shortest (or longest) path lengths from src to every vertex of a DAG by
+        relaxing edges in topological order, in O(V+E)
+        Unreachable vertices get inf (-inf when longest), None if the graph has a cycle
+        """
+        order = self.topological_order()
+        if order is None:
+            return None
+
+        unreached = float('-inf') if longest else float('inf')
+        paths = [unreached] * self.v_count
+        if src < 0 or src >= self.v_count:
+            return paths
+        paths[src] = 0
+        for vertex in order:
+            v_len = paths[vertex]
+            if v_len == unreached:
+                continue
+            for dst, edge in self._neighbors(vertex):
+                new_len = v_len + edge
+                if (new_len > paths[dst]) if longest else (new_len < paths[dst]):
+                    paths[dst] = new_len
 
+        return paths
+
+    @profiled
+    @cached_query
     def dijkstra(self, src: int) -> []:
         """
         Computes the shortest path from a given vertex to other vertices
         """
+        distance, _ = self._dijkstra(src)
 
-        matrix = self.adj_matrix
-        size = len(matrix)
+        paths = list()
+        for vertex in range(self.v_count):
+            paths.append(distance.get(vertex, float('inf')))
+
+        return paths
+
+    def dijkstra_many(self, sources, workers=None):
+        """
+        Yield (src, distances) for every src in sources, in order,
+        computing the rows in a pool of worker processes (see parallel.py)
+        """
+        from parallel import dijkstra_many
+
+        return dijkstra_many(self, sources, workers)
+
+    def contraction_hierarchy(self, witness_limit=64):
+        """
+        Return ContractionHierarchy of the graph for fast repeated point-to-point queries
+        (see contraction.py); it does not follow later edits of the graph
+        """
+        from contraction import ContractionHierarchy
+
+        return ContractionHierarchy.build(self, witness_limit)
+
+    @profiled
+    @cached_query
+    def shortest_path(self, src: int, dst: int, bidirectional=False) -> []:
+        """
+        Return list of vertices on the shortest path from src to dst,
+        empty list if dst is not reachable
+        If bidirectional is True, search forward from src and backward from dst at once
+        """
+        last = self.v_count - 1
+        if src < 0 or dst < 0 or src > last or dst > last:
+            return list()
+        if bidirectional:
+            return self._bidirectional_dijkstra(src, dst)
+
+        distance, previous = self._dijkstra(src, dst)
+        if dst not in distance:
+            return list()
 
-        visited = dict()
-        priority_q = deque(list())
-        priority_q.append((0, src))
+        path = [dst]
+        while path[-1] != src:
+            path.append(previous[path[-1]])
+        path.reverse()
+
+        return path
+
+    def all_pairs_shortest_paths(self, next_hop=False, block_size=256):
+        """
+        Return V x V NumPy array of shortest path lengths (inf where unreachable),
+        computed by Floyd-Warshall as vectorized min-plus updates
+        If next_hop is True, return (distances, next_hops) instead, where next_hops[i][j]
+        is the vertex after i on a shortest path from i to j (-1 if there is none)
+        Rows are updated block_size at a time to bound the temporary buffer
+        """
+        # optional dependency, only this method needs it
+        import numpy as np
+
+        size = self.v_count
+        dist = np.full((size, size), np.inf)
+        for src in range(size):
+            neighbors = self._neighbors(src)
+            if len(neighbors) > 0:
+                targets, weights = zip(*neighbors)
+                dist[src, list(targets)] = weights
+        np.fill_diagonal(dist, 0)
+
+        hops = None
+        if next_hop:
+            hops = np.where(np.isfinite(dist), np.arange(size), -1)
+
+        block_size = max(1, min(block_size, size))
+        candidate = np.empty((block_size, size))
+        for k in range(size):
+            row_k = dist[k]
+            for start in range(0, size, block_size):
+                end = min(start + block_size, size)
+                block = dist[start:end]
+                through_k = candidate[:end - start]
+                # dist[i][k] + dist[k][j] for every i in the block and every j
+                np.add(block[:, k:k + 1], row_k, out=through_k)
+                if next_hop:
+                    hop_block = hops[start:end]
+                    np.copyto(hop_block, np.broadcast_to(hop_block[:, k:k + 1], hop_block.shape),
+                              where=through_k < block)
+                np.minimum(block, through_k, out=block)
+
+        if next_hop:
+            return dist, hops
+        return dist
+
+    @profiled
+    def astar(self, src: int, dst: int, heuristic=None, coords=None, metric='euclidean'):
+        """
+        Return (path, cost, expanded) of an A* search from src to dst:
+        path is the list of vertices (empty if dst is not reachable, then cost is inf)
+        and expanded is the number of vertices taken off the frontier
+        heuristic(v, dst) estimates the remaining cost; alternatively pass per-vertex
+        coords and a metric ('euclidean', 'haversine' or a callable, see heuristics.py)
+        Without either it behaves like Dijkstra
+        """
+        inf = float('inf')
+        last = self.v_count - 1
+        if src < 0 or dst < 0 or src > last or dst > last:
+            return list(), inf, 0
+
+        if heuristic is None and coords is not None:
+            from heuristics import from_coordinates
+            heuristic = from_coordinates(coords, metric)
+        if heuristic is None:
+            def heuristic(v, target):
+                return 0
+
+        # estimates are computed once per vertex
+        estimate = {src: heuristic(src, dst)}
+        best = {src: 0}
+        previous = dict()
+        expanded = 0
+        priority_q = [(estimate[src], 0, src)]
+        while len(priority_q) > 0:
+            _, v_len, vertex = heapq.heappop(priority_q)
+            # skip stale entries, a vertex is expanded again only if its cost improved
+            if v_len > best[vertex]:
+                continue
+            expanded += 1
+            if vertex == dst:
+                path = [dst]
+                while path[-1] != src:
+                    path.append(previous[path[-1]])
+                path.reverse()
+                return path, v_len, expanded
+
+            for successor, edge in self._neighbors(vertex):
+                new_len = v_len + edge
+                if new_len < best.get(successor, inf):
+                    best[successor] = new_len
+                    previous[successor] = vertex
+                    if successor not in estimate:
+                        estimate[successor] = heuristic(successor, dst)
+                    heapq.heappush(priority_q, (new_len + estimate[successor], new_len, successor))
+
+        return list(), inf, expanded
+
+    def _dijkstra(self, src: int, dst=None):
+        """
+        Binary-heap Dijkstra with lazy deletion, stopping once dst (if given) is settled
+        Return (distance, previous) dicts for the settled vertices
+        """
+        inf = float('inf')
+        distance = dict()
+        previous = dict()
+        best = {src: 0}
+        priority_q = [(0, src)]
         while len(priority_q) > 0:
-            # dequeue shortest path
-            v_tuple = priority_q.popleft()
-            v_len = v_tuple[0]
-            vertex = v_tuple[1]
-            if vertex not in visited:
-                visited[vertex] = v_len
-
-                index = 0
-                for edge in matrix[vertex]:
-                    if edge > 0:
-                        priority_q.append((edge + v_len, index))
-                    index += 1
-                # sort priority queue
-                to_list = list(priority_q)
-                to_list.sort()
-                priority_q = deque(to_list)
+            # dequeue shortest path, skipping stale entries
+            v_len, vertex = heapq.heappop(priority_q)
+            if vertex in distance:
+                continue
+            distance[vertex] = v_len
+            if vertex == dst:
+                break
+
+            for successor, edge in self._neighbors(vertex):
+                new_len = v_len + edge
+                if successor not in distance and new_len < best.get(successor, inf):
+                    best[successor] = new_len
+                    previous[successor] = vertex
+                    heapq.heappush(priority_q, (new_len, successor))
+
+        return distance, previous
+
+    def _bidirectional_dijkstra(self, src: int, dst: int) -> []:
+        """
+        Return shortest path from src to dst found by a forward search over out-edges and a
+        reverse search over in-edges, stopping once the two frontiers cannot improve on the
+        best meeting point
+        """
+        inf = float('inf')
+        # index 0: forward search from src, index 1: reverse search from dst
+        best = ({src: 0}, {dst: 0})
+        settled = (set(), set())
+        link = (dict(), dict())
+        queues = ([(0, src)], [(0, dst)])
+        expand = (self._neighbors, self._in_neighbors)
+
+        shortest = 0 if src == dst else inf
+        meet = src if src == dst else None
+        while True:
+            top = [queue[0][0] if len(queue) > 0 else inf for queue in queues]
+            if top[0] + top[1] >= shortest:
+                break
+
+            # grow the side with the closer frontier
+            side = 0 if top[0] <= top[1] else 1
+            v_len, vertex = heapq.heappop(queues[side])
+            if vertex in settled[side]:
+                continue
+            settled[side].add(vertex)
+
+            other = best[1 - side]
+            for successor, edge in expand[side](vertex):
+                new_len = v_len + edge
+                if new_len < best[side].get(successor, inf):
+                    best[side][successor] = new_len
+                    link[side][successor] = vertex
+                    heapq.heappush(queues[side], (new_len, successor))
+                    if successor in other and new_len + other[successor] < shortest:
+                        shortest = new_len + other[successor]
+                        meet = successor
+
+        if meet is None:
+            return list()
 
-        paths = list()
-        for vertex in range(size):
-            if vertex not in visited:
-                visited[vertex] = float('inf')
-            paths.append(visited[vertex])
+        path = [meet]
+        while path[-1] != src:
+            path.append(link[0][path[-1]])
+        path.reverse()
+        while path[-1] != dst:
+            path.append(link[1][path[-1]])
 
-        return paths
+        return path
+
+    # ------------------------------------------------------------------ #
+
+    def _neighbors(self, v: int) -> []:
+        """
+        Return list of (dst, weight) pairs for the out-edges of v,
+        in ascending order of dst
+        """
+        return [(dst, weight) for dst, weight in enumerate(self.adj_matrix[v]) if weight > 0]
+
+    def _in_neighbors(self, v: int) -> []:
+        """
+        Return list of (src, weight) pairs for the in-edges of v,
+        in ascending order of src
+        """
+        return [(src, row[v]) for src, row in enumerate(self.adj_matrix) if row[v] > 0]
+
+    def _weight(self, src: int, dst: int):
+        """
+        Return weight of edge src -> dst, 0 if there is no such edge
+        """
+        return self.adj_matrix[src][dst]
 
 
 
@@ -348,3 +772,56 @@ if __name__ == '__main__':
     print('\n', g)
     for i in range(5):
         print(f'DIJKSTRA {i} {g.dijkstra(i)}')
+
+    print("\nPDF - shortest_path() example 1")
+    print("-------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    for src, dst in [(0, 2), (2, 0), (3, 4), (1, 1)]:
+        path = g.shortest_path(src, dst)
+        print(f'{src}->{dst} {path} valid={g.is_valid_path(path)} '
+              f'bidirectional={g.shortest_path(src, dst, bidirectional=True)}')
+    g.remove_edge(1, 4)
+    print(f'0->2 {g.shortest_path(0, 2)}')
+
+    print("\nPDF - has_cycle(return_cycle=True) example 1")
+    print("--------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    print(g.has_cycle(return_cycle=True))
+    for src, dst in [(4, 0), (3, 1), (2, 1)]:
+        g.remove_edge(src, dst)
+        print(g.has_cycle(return_cycle=True))
+
+    print("\nPDF - astar() example 1")
+    print("-----------------------")
+    coords = [(0, 0), (8, 6), (30, 10), (20, 0), (12, 0)]
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 8),
+             (3, 1, 15), (2, 1, 23), (3, 2, 15)]
+    g = DirectedGraph(edges)
+    for src, dst in [(0, 2), (2, 0), (3, 4)]:
+        print(f'{src}->{dst} {g.astar(src, dst, coords=coords)} DIJKSTRA {g.dijkstra(src)[dst]}')
+
+    print("\nPDF - topological_order() / dag_paths() example 1")
+    print("-------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    print(g.topological_order())
+    for src, dst in [(1, 4), (3, 1), (4, 0)]:
+        g.remove_edge(src, dst)
+    print(g.topological_order())
+    for i in range(5):
+        print(f'DAG {i} {g.dag_paths(i)} LONGEST {g.dag_paths(i, longest=True)}')
+
+    print("\nPDF - strongly_connected_components() example 1")
+    print("-----------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7), (5, 6, 2), (6, 5, 4), (2, 5, 1)]
+    g = DirectedGraph(edges)
+    print(g.strongly_connected_components(), g.count_strongly_connected_components())
+    g.remove_edge(3, 2)
+    labels, dag = g.condensation()
+    print(labels, dag.get_edges())
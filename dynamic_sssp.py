@@ -0,0 +1,178 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Single-source shortest paths on a DirectedGraph kept up to date under edge updates,
+# in the style of Ramalingam-Reps: a weight decrease is pushed forward from the edge's head, and a
+# weight increase or deletion on the shortest-path tree only recomputes the subtree it cuts off.
+
+import heapq
+
+# a deletion or increase that cuts off more than 1 / REROUTE_LIMIT of the vertices recomputes all
+REROUTE_LIMIT = 4
+
+
+class DynamicShortestPaths:
+    """
+    Class to maintain dijkstra(src) of a DirectedGraph under edge updates
+    - edit the graph through add_edge / remove_edge of this class to get incremental repair
+    - edits made directly on the graph are detected and trigger a full recomputation
+    - the first increase or deletion on a tree edge reads in-edges, which makes a
+      CSRDirectedGraph build its reversed arrays once; later edits only patch rows
+    """
+
+    def __init__(self, graph, src: int):
+        """
+        Store graph, source and its shortest-path tree
+        """
+        self.graph = graph
+        self.src = src
+        self._recompute()
+
+    def distances(self) -> []:
+        """
+        Return shortest path lengths from src to every vertex, like graph.dijkstra(src)
+        """
+        self._sync()
+        return list(self.distance)
+
+    def path_to(self, dst: int) -> []:
+        """
+        Return list of vertices on the shortest path from src to dst,
+        empty list if dst is not reachable
+        """
+        self._sync()
+        if dst < 0 or dst >= len(self.distance) or self.distance[dst] == float('inf'):
+            return list()
+        path = [dst]
+        while path[-1] != self.src:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
+
+    def add_edge(self, src: int, dst: int, weight=1) -> None:
+        """
+        Add or re-weight edge src -> dst in the graph and repair the shortest paths
+        """
+        self._sync()
+        old = self.graph._weight(src, dst) if self._in_range(src, dst) else 0
+        version = self.graph._version
+        self.graph.add_edge(src, dst, weight)
+        if self.graph._version != version:
+            self._version = self.graph._version
+            self._repair(src, dst, old, self.graph._weight(src, dst))
+
+    def remove_edge(self, src: int, dst: int) -> None:
+        """
+        Remove edge src -> dst from the graph and repair the shortest paths
+        """
+        self._sync()
+        old = self.graph._weight(src, dst) if self._in_range(src, dst) else 0
+        version = self.graph._version
+        self.graph.remove_edge(src, dst)
+        if self.graph._version != version:
+            self._version = self.graph._version
+            self._repair(src, dst, old, 0)
+
+    # ------------------------------------------------------------------ #
+
+    def _in_range(self, src: int, dst: int) -> bool:
+        """
+        Return True if both vertices exist in the graph
+        """
+        return 0 <= src < self.graph.v_count and 0 <= dst < self.graph.v_count
+
+    def _sync(self) -> None:
+        """
+        Recompute from scratch if the graph was edited behind our back
+        """
+        if self.graph._version != self._version:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        """
+        Run a full Dijkstra from src and rebuild the shortest-path tree
+        """
+        inf = float('inf')
+        size = self.graph.v_count
+        self.distance = [inf] * size
+        self.parent = [None] * size
+        self.children = [set() for _ in range(size)]
+        if 0 <= self.src < size:
+            distance, previous = self.graph._dijkstra(self.src)
+            for vertex, v_len in distance.items():
+                self.distance[vertex] = v_len
+                if vertex in previous:
+                    self._set_parent(vertex, previous[vertex])
+        self._version = self.graph._version
+
+    def _set_parent(self, vertex: int, parent) -> None:
+        """
+        Move vertex under parent in the shortest-path tree
+        """
+        old = self.parent[vertex]
+        if old is not None:
+            self.children[old].discard(vertex)
+        self.parent[vertex] = parent
+        if parent is not None:
+            self.children[parent].add(vertex)
+
+    def _repair(self, src: int, dst: int, old, new) -> None:
+        """
+        Update the tree after edge src -> dst changed weight from old to new (0: no edge)
+        """
+        if new > 0 and self.distance[src] + new < self.distance[dst]:
+            # decrease: dst (and possibly vertices beyond it) get shorter paths
+            self.distance[dst] = self.distance[src] + new
+            self._set_parent(dst, src)
+            self._propagate([(self.distance[dst], dst)])
+        elif self.parent[dst] == src and (new == 0 or new > old):
+            # increase on a tree edge: only the subtree under dst can get longer
+            self._reroute(dst)
+
+    def _reroute(self, root: int) -> None:
+        """
+        Recompute distances of the subtree under root, whose tree edge got longer
+        """
+        inf = float('inf')
+        affected = list()
+        stack = [root]
+        while len(stack) > 0:
+            vertex = stack.pop()
+            affected.append(vertex)
+            stack.extend(self.children[vertex])
+        # a large cut-off subtree is cheaper to redo with one full Dijkstra
+        if len(affected) > len(self.distance) // REROUTE_LIMIT:
+            self._recompute()
+            return
+        for vertex in affected:
+            self.distance[vertex] = inf
+            self._set_parent(vertex, None)
+
+        # best entry into each affected vertex from the unaffected part of the tree
+        priority_q = list()
+        for vertex in affected:
+            for pred, edge in self.graph._in_neighbors(vertex):
+                if self.distance[pred] + edge < self.distance[vertex]:
+                    self.distance[vertex] = self.distance[pred] + edge
+                    self._set_parent(vertex, pred)
+            if self.distance[vertex] < inf:
+                priority_q.append((self.distance[vertex], vertex))
+        heapq.heapify(priority_q)
+
+        self._propagate(priority_q)
+
+    def _propagate(self, priority_q) -> None:
+        """
+        Dijkstra from the given (distance, vertex) heap, relaxing only edges that improve
+        """
+        distance = self.distance
+        while len(priority_q) > 0:
+            v_len, vertex = heapq.heappop(priority_q)
+            if v_len > distance[vertex]:
+                continue
+            for successor, edge in self.graph._neighbors(vertex):
+                new_len = v_len + edge
+                if new_len < distance[successor]:
+                    distance[successor] = new_len
+                    self._set_parent(successor, vertex)
+                    heapq.heappush(priority_q, (new_len, successor))
@@ -0,0 +1,136 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Streaming loader for edge-list files. Lines are read lazily and parsed in chunks
+# through a generator pipeline, then the graph is built in bulk with a single validation pass.
+# Directed files hold "src dst [weight]" lines, undirected files hold "u v" lines; fields may be
+# separated by tabs or spaces, and blank lines and lines starting with '#' are skipped.
+
+import argparse
+import time
+from itertools import chain
+
+from csr_graph import CSRDirectedGraph
+from ud_graph import UndirectedGraph
+
+
+def read_fields(path: str):
+    """
+    Yield list of fields for every data line of the file
+    """
+    with open(path, 'r') as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) == 0 or fields[0].startswith('#'):
+                continue
+            yield fields
+
+
+def parse_directed(rows):
+    """
+    Yield (src, dst, weight) tuples, weight defaults to 1
+    """
+    for fields in rows:
+        weight = 1
+        if len(fields) > 2:
+            weight = _number(fields[2])
+        yield int(fields[0]), int(fields[1]), weight
+
+
+def parse_undirected(rows):
+    """
+    Yield (u, v) tuples
+    """
+    for fields in rows:
+        yield fields[0], fields[1]
+
+
+def chunked(edges, chunk_size: int):
+    """
+    Yield lists of at most chunk_size edges
+    """
+    chunk = list()
+    for edge in edges:
+        chunk.append(edge)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = list()
+    if len(chunk) > 0:
+        yield chunk
+
+
+def load_directed(path: str, chunk_size=65536):
+    """
+    Return (graph, stats): CSRDirectedGraph built from a "src dst [weight]" file,
+    stats is a dict with edges read, seconds and edges_per_sec
+    """
+    stats = _Counter()
+    start = time.perf_counter()
+    chunks = stats.count(chunked(parse_directed(read_fields(path)), chunk_size))
+    graph = CSRDirectedGraph.from_edges(chain.from_iterable(chunks))
+    return graph, stats.report(time.perf_counter() - start)
+
+
+def load_undirected(path: str, chunk_size=65536):
+    """
+    Return (graph, stats): UndirectedGraph built from a "u v" file,
+    stats is a dict with edges read, seconds and edges_per_sec
+    """
+    stats = _Counter()
+    start = time.perf_counter()
+    graph = UndirectedGraph()
+    for chunk in stats.count(chunked(parse_undirected(read_fields(path)), chunk_size)):
+        graph.add_edges(chunk)
+    return graph, stats.report(time.perf_counter() - start)
+
+
+def _number(text: str):
+    """
+    Return text as int if it is one, float otherwise
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class _Counter:
+    """
+    Counts edges flowing through the chunk pipeline
+    """
+
+    def __init__(self):
+        self.edges = 0
+
+    def count(self, chunks):
+        """
+        Yield chunks unchanged, counting their edges
+        """
+        for chunk in chunks:
+            self.edges += len(chunk)
+            yield chunk
+
+    def report(self, seconds: float) -> dict:
+        """
+        Return throughput stats for the given elapsed time
+        """
+        rate = self.edges / seconds if seconds > 0 else float('inf')
+        return {'edges': self.edges, 'seconds': seconds, 'edges_per_sec': rate}
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Load an edge-list file and report throughput')
+    parser.add_argument('path')
+    parser.add_argument('--undirected', action='store_true', help='file holds "u v" lines')
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args()
+
+    if args.undirected:
+        g, result = load_undirected(args.path, args.chunk_size)
+        print(f'{len(g.get_vertices())} vertices')
+    else:
+        g, result = load_directed(args.path, args.chunk_size)
+        print(f'{g.v_count} vertices')
+    print(f"{result['edges']} edges in {result['seconds']:.3f}s "
+          f"({result['edges_per_sec']:,.0f} edges/sec)")
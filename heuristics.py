@@ -0,0 +1,47 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Distance heuristics for A* search on DirectedGraph. Each metric takes two coordinate
+# pairs; from_coordinates() turns per-vertex coordinates into a heuristic(v, dst) callable.
+
+import math
+
+# mean Earth radius in kilometres
+EARTH_RADIUS = 6371.0088
+
+
+def euclidean(a, b) -> float:
+    """
+    Return straight-line distance between points a = (x, y) and b = (x, y)
+    """
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def haversine(a, b) -> float:
+    """
+    Return great-circle distance in kilometres between a = (lat, lon) and b = (lat, lon),
+    given in degrees
+    """
+    lat_a, lon_a = math.radians(a[0]), math.radians(a[1])
+    lat_b, lon_b = math.radians(b[0]), math.radians(b[1])
+    h = (math.sin((lat_b - lat_a) / 2) ** 2
+         + math.cos(lat_a) * math.cos(lat_b) * math.sin((lon_b - lon_a) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+
+METRICS = {'euclidean': euclidean, 'haversine': haversine}
+
+
+def from_coordinates(coords, metric='euclidean', scale=1.0):
+    """
+    Return heuristic(v, dst) = scale * metric(coords[v], coords[dst])
+    It is admissible when no edge weight is below scale times the metric distance
+    between its endpoints
+    """
+    if metric in METRICS:
+        metric = METRICS[metric]
+
+    def heuristic(v, dst) -> float:
+        return scale * metric(coords[v], coords[dst])
+
+    return heuristic
@@ -0,0 +1,505 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: UndirectedGraph with interned vertex IDs. Every label is mapped once to a dense int,
+# and each vertex keeps its neighbours as a sorted array('i') of IDs instead of a set of labels,
+# so traversals run on small ints and a neighbour costs 4 bytes. Labels only appear at the public
+# API; neighbour arrays are kept in label order, so visit order matches UndirectedGraph.
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping
+
+from profiling import profiled
+from query_cache import cached_query
+from ud_graph import DisjointSet, UndirectedGraph
+
+
+class InternedUndirectedGraph(UndirectedGraph):
+    """
+    Class to implement undirected graph on interned integer vertex IDs
+    - same public API as UndirectedGraph (vertex names are strings)
+    - adj_list is a read-only view: looking up a vertex builds its neighbour set,
+      edit through the methods
+    """
+
+    # neighbour hooks the profiler counts through
+    _expansion_hooks = (('_neighbor_ids', False),)
+
+    def __init__(self, start_edges=None):
+        """
+        Store graph info as label -> ID table and per-ID sorted neighbour arrays
+        """
+        # label -> ID (in insertion order), ID -> label (None once removed),
+        # ID -> neighbour IDs sorted by label
+        self._ids = dict()
+        self._labels = list()
+        self._adj = list()
+        # removed IDs still holding a slot
+        self._removed = 0
+
+        if start_edges is not None:
+            for u, v in start_edges:
+                self.add_edge(u, v)
+
+    @property
+    def adj_list(self):
+        """
+        Return read-only mapping of label -> NeighborSet of neighbour labels
+        """
+        return _AdjacencyView(self)
+
+    # ------------------------------------------------------------------ #
+
+    def add_vertex(self, v: str) -> None:
+        """
+        Add new vertex to the graph
+        """
+        if v not in self._ids:
+            vertex = self._intern(v)
+            self._version += 1
+            if self._components is not None:
+                self._components.add(vertex)
+
+    def add_edge(self, u: str, v: str) -> None:
+        """
+        Add edge to the graph
+        """
+        if u == v:
+            return
+
+        u_id = self._intern(u)
+        v_id = self._intern(v)
+        label_of = self._labels.__getitem__
+        neighbors = self._adj[u_id]
+        index = bisect_left(neighbors, v, key=label_of)
+        if index < len(neighbors) and neighbors[index] == v_id:
+            return
+        neighbors.insert(index, v_id)
+        other = self._adj[v_id]
+        other.insert(bisect_left(other, u, key=label_of), u_id)
+        self._version += 1
+
+        if self._components is not None:
+            self._components.add(u_id)
+            self._components.add(v_id)
+            self._components.union(u_id, v_id)
+
+    def add_edges(self, edges) -> None:
+        """
+        Add (u, v) edges to the graph in bulk
+        """
+        touched = set()
+        for u, v in edges:
+            if u == v:
+                continue
+            u_id = self._intern(u)
+            v_id = self._intern(v)
+            self._adj[u_id].append(v_id)
+            self._adj[v_id].append(u_id)
+            touched.add(u_id)
+            touched.add(v_id)
+
+        # sort and drop duplicates once per vertex instead of once per edge
+        label_of = self._labels.__getitem__
+        for vertex in touched:
+            self._adj[vertex] = array('i', sorted(set(self._adj[vertex]), key=label_of))
+        self._version += 1
+        self._components = None
+
+    def remove_edge(self, v: str, u: str) -> None:
+        """
+        Remove edge from the graph
+        """
+        if v not in self._ids or u not in self._ids:
+            return
+
+        v_id = self._ids[v]
+        u_id = self._ids[u]
+        if self._discard(v_id, u_id):
+            self._discard(u_id, v_id)
+            self._version += 1
+            self._components = None
+
+    def remove_vertex(self, v: str) -> None:
+        """
+        Remove vertex and all connected edges
+        """
+        if v not in self._ids:
+            return
+
+        vertex = self._ids.pop(v)
+        for neighbor in self._adj[vertex]:
+            self._discard(neighbor, vertex)
+        self._adj[vertex] = array('i')
+        self._labels[vertex] = None
+        # freed IDs keep their slot until they make up half of all IDs
+        self._removed += 1
+        if 2 * self._removed > len(self._labels):
+            self._compact()
+        self._version += 1
+        self._components = None
+
+    def get_vertices(self) -> []:
+        """
+        Return list of vertices in the graph (any order)
+        """
+        return list(self._ids)
+
+    def get_edges(self) -> []:
+        """
+        Return list of edges in the graph (any order)
+        """
+        labels = self._labels
+        lst_edges = list()
+        for label, vertex in self._ids.items():
+            for neighbor in self._adj[vertex]:
+                if neighbor > vertex:
+                    lst_edges.append((label, labels[neighbor]))
+        return lst_edges
+
+    def is_valid_path(self, path: []) -> bool:
+        """
+        Return true if provided path is valid, False otherwise
+        """
+        if len(path) == 0:
+            return True
+        if path[0] not in self._ids:
+            return False
+
+        vertex = self._ids[path[0]]
+        for label in path[1:]:
+            following = self._ids.get(label)
+            if following is None or not self._has_edge(vertex, following):
+                return False
+            vertex = following
+        return True
+
+    def iter_dfs(self, v_start, v_end=None, with_info=False):
+        """
+        Yield vertices in the order dfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
+        """
+        if v_start not in self._ids:
+            return
+
+        labels = self._labels
+        neighbors = self._neighbor_ids
+        end = self._ids.get(v_end, -1)
+        seen = bytearray(len(labels))
+        stack = [self._ids[v_start]]
+        info = deque(list())
+        info.append((0, None))
+        while len(stack) > 0:
+            pick = stack.pop()
+            if with_info:
+                depth, parent = info.pop()
+            if not seen[pick]:
+                seen[pick] = 1
+                yield (labels[pick], depth, parent) if with_info else labels[pick]
+                if pick == end:
+                    return
+
+                # neighbour arrays are in label order, so successors pop in ascending label order
+                successors = neighbors(pick)
+                stack.extend(reversed(successors))
+                if with_info:
+                    info.extend([(depth + 1, labels[pick])] * len(successors))
+
+    def iter_bfs(self, v_start, v_end=None, with_info=False):
+        """
+        Yield vertices in the order bfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
+        """
+        if v_start not in self._ids:
+            return
+
+        labels = self._labels
+        neighbors = self._neighbor_ids
+        end = self._ids.get(v_end, -1)
+        start = self._ids[v_start]
+        seen = bytearray(len(labels))
+        seen[start] = 1
+        queue = deque(list())
+        queue.append((start, 0, None))
+        while len(queue) > 0:
+            pick, depth, parent = queue.popleft()
+            yield (labels[pick], depth, parent) if with_info else labels[pick]
+            if pick == end:
+                return
+
+            for successor in neighbors(pick):
+                if not seen[successor]:
+                    seen[successor] = 1
+                    queue.append((successor, depth + 1, labels[pick]))
+
+    @profiled
+    @cached_query
+    def shortest_path(self, v_start, v_end) -> []:
+        """
+        Return list of vertices on a shortest path from v_start to v_end,
+        empty list if there is none
+        Runs a meet-in-the-middle BFS that grows the smaller frontier one level at a time
+        """
+        if v_start not in self._ids or v_end not in self._ids:
+            return list()
+        if v_start == v_end:
+            return [v_start]
+
+        neighbors = self._neighbor_ids
+        start = self._ids[v_start]
+        end = self._ids[v_end]
+        # index 0: search from v_start, index 1: search from v_end
+        parents = ({start: -1}, {end: -1})
+        frontiers = ([start], [end])
+        meet = -1
+        while meet < 0 and len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own = parents[side]
+            other = parents[1 - side]
+            next_frontier = list()
+            for vertex in frontiers[side]:
+                for neighbor in neighbors(vertex):
+                    if neighbor in own:
+                        continue
+                    own[neighbor] = vertex
+                    if neighbor in other:
+                        meet = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meet >= 0:
+                    break
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+        if meet < 0:
+            return list()
+
+        path = [meet]
+        while parents[0][path[-1]] >= 0:
+            path.append(parents[0][path[-1]])
+        path.reverse()
+        while parents[1][path[-1]] >= 0:
+            path.append(parents[1][path[-1]])
+
+        return [self._labels[vertex] for vertex in path]
+
+    def _multi_bfs_batch(self, batch: [], result: dict) -> None:
+        """
+        Fill result[source] for every source in batch; bit i of a mask stands for batch[i]
+        """
+        labels = self._labels
+        neighbors = self._neighbor_ids
+        batch = [source for source in batch if source in self._ids]
+        hops = [result[source] for source in batch]
+        seen = [0] * len(labels)
+        frontier = dict()
+        for index, source in enumerate(batch):
+            frontier[self._ids[source]] = 1 << index
+            seen[self._ids[source]] = 1 << index
+            result[source][source] = 0
+
+        level = 0
+        while len(frontier) > 0:
+            level += 1
+            # sources reaching each neighbour of the frontier for the first time
+            reached = dict()
+            for vertex, mask in frontier.items():
+                for neighbor in neighbors(vertex):
+                    new = mask & ~seen[neighbor]
+                    if new:
+                        reached[neighbor] = reached.get(neighbor, 0) | new
+
+            # each level is listed in label order
+            frontier = dict()
+            for vertex in sorted(reached, key=labels.__getitem__):
+                new = reached[vertex]
+                seen[vertex] |= new
+                frontier[vertex] = new
+                label = labels[vertex]
+                while new:
+                    bit = new & -new
+                    hops[bit.bit_length() - 1][label] = level
+                    new ^= bit
+
+    @profiled
+    def count_connected_components(self):
+        """
+        Return number of connected components in the graph
+        """
+        return self._component_index().count
+
+    def same_component(self, u: str, v: str) -> bool:
+        """
+        Return True if u and v are in the same connected component, False otherwise
+        """
+        if u not in self._ids or v not in self._ids:
+            return False
+        components = self._component_index()
+        return components.find(self._ids[u]) == components.find(self._ids[v])
+
+    def component_of(self, v: str):
+        """
+        Return representative vertex of the connected component containing v,
+        None if v is not in the graph
+        """
+        if v not in self._ids:
+            return None
+        components = self._component_index()
+        return self._labels[components.find(self._ids[v])]
+
+    @profiled
+    def has_cycle(self, return_cycle=False):
+        """
+        Return True if graph contains a cycle, False otherwise
+        If return_cycle is True, return the cycle found as a closed path
+        [v, ..., v] instead (empty list if there is none)
+        """
+        neighbors = self._neighbor_ids
+        visited = bytearray(len(self._labels))
+        for root in range(len(self._labels)):
+            if visited[root]:
+                continue
+
+            # parent tracking: any visited neighbour other than the parent closes a cycle
+            visited[root] = 1
+            path = [root]
+            stack = [(-1, iter(neighbors(root)))]
+            while len(stack) > 0:
+                parent, successors = stack[-1]
+                for successor in successors:
+                    if successor == parent:
+                        continue
+                    if not visited[successor]:
+                        visited[successor] = 1
+                        stack.append((path[-1], iter(neighbors(successor))))
+                        path.append(successor)
+                        break
+                    if return_cycle:
+                        cycle = path[path.index(successor):] + [successor]
+                        return [self._labels[vertex] for vertex in cycle]
+                    return True
+                else:
+                    path.pop()
+                    stack.pop()
+
+        if return_cycle:
+            return list()
+        return False
+
+    # ------------------------------------------------------------------ #
+
+    def _neighbor_ids(self, vertex: int):
+        """
+        Return array of neighbour IDs of vertex in label order (shared, do not modify)
+        """
+        return self._adj[vertex]
+
+    def _intern(self, label) -> int:
+        """
+        Return ID of label, adding it as a new vertex if needed
+        """
+        vertex = self._ids.get(label)
+        if vertex is None:
+            vertex = len(self._labels)
+            self._ids[label] = vertex
+            self._labels.append(label)
+            self._adj.append(array('i'))
+        return vertex
+
+    def _has_edge(self, u: int, v: int) -> bool:
+        """
+        Return True if v is in the neighbour array of u
+        """
+        neighbors = self._adj[u]
+        index = bisect_left(neighbors, self._labels[v], key=self._labels.__getitem__)
+        return index < len(neighbors) and neighbors[index] == v
+
+    def _discard(self, u: int, v: int) -> bool:
+        """
+        Remove v from the neighbour array of u, return True if it was there
+        """
+        neighbors = self._adj[u]
+        index = bisect_left(neighbors, self._labels[v], key=self._labels.__getitem__)
+        if index < len(neighbors) and neighbors[index] == v:
+            del neighbors[index]
+            return True
+        return False
+
+    def _compact(self) -> None:
+        """
+        Renumber IDs densely, dropping removed IDs (IDs keep their relative order,
+        neighbour arrays stay in label order)
+        """
+        renumber = array('i', [-1]) * len(self._labels)
+        live = list()
+        for old, label in enumerate(self._labels):
+            if label is not None:
+                renumber[old] = len(live)
+                live.append(label)
+
+        self._adj = [array('i', map(renumber.__getitem__, self._adj[old]))
+                     for old, label in enumerate(self._labels) if label is not None]
+        self._ids = {label: renumber[old] for label, old in self._ids.items()}
+        self._labels = live
+        self._removed = 0
+        self._components = None
+
+    def _component_index(self):
+        """
+        Return the union-find component index over IDs, rebuilding it if needed
+        """
+        if self._components is None:
+            components = DisjointSet()
+            for vertex in self._ids.values():
+                components.add(vertex)
+            for vertex in self._ids.values():
+                for neighbor in self._neighbor_ids(vertex):
+                    if neighbor > vertex:
+                        components.union(vertex, neighbor)
+            self._components = components
+        return self._components
+
+
+class _AdjacencyView(Mapping):
+    """
+    Read-only label -> NeighborSet view of an InternedUndirectedGraph, built per lookup
+    """
+
+    def __init__(self, graph: InternedUndirectedGraph):
+        self.graph = graph
+
+    def __getitem__(self, label):
+        graph = self.graph
+        labels = graph._labels
+        neighbors = graph.neighbor_set()
+        for neighbor in graph._adj[graph._ids[label]]:
+            neighbors.add(labels[neighbor])
+        return neighbors
+
+    def __contains__(self, label):
+        return label in self.graph._ids
+
+    def __iter__(self):
+        return iter(self.graph._ids)
+
+    def __len__(self):
+        return len(self.graph._ids)
+
+
+if __name__ == '__main__':
+
+    print("\nPDF - InternedUndirectedGraph matches UndirectedGraph")
+    print("-----------------------------------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = InternedUndirectedGraph(edges)
+    ref = UndirectedGraph(edges)
+    print(g)
+    test_cases = 'ABCDEGH'
+    for case in test_cases:
+        print(f'{case} DFS:{g.dfs(case)} BFS:{g.bfs(case)}',
+              g.dfs(case) == ref.dfs(case) and g.bfs(case) == ref.bfs(case))
+    print(g.count_connected_components(), g.has_cycle(), g.shortest_path('A', 'H'))
+    g.remove_vertex('C')
+    g.remove_edge('B', 'E')
+    print(g.get_edges(), g.has_cycle(return_cycle=True), g.component_of('Q'))
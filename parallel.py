@@ -0,0 +1,74 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Multi-source Dijkstra across a process pool. The graph is written once as a snapshot
+# that every worker mmaps at start-up, so it is shared between processes instead of being pickled
+# with each task; distance rows stream back in the order of the sources.
+
+import itertools
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from snapshot import is_mapped, load_directed, save_directed
+
+# graph of the current worker process, set by _init_worker
+_worker_graph = None
+
+
+def dijkstra_many(graph, sources, workers=None, chunksize=16):
+    """
+    Yield (src, distances) for every src in sources, in order, where distances is the
+    list graph.dijkstra(src) would return; workers defaults to the number of CPUs
+    Work is sent in chunks of chunksize sources, at most 2 chunks per worker ahead of the
+    caller, so a slow caller holds back the workers instead of piling up rows
+    """
+    workers = workers or os.cpu_count() or 1
+    folder = None
+    # an edited graph is written out again (edited rows included): workers must not map a stale file
+    if is_mapped(graph):
+        path = graph._snapshot_path
+    else:
+        folder = tempfile.mkdtemp(prefix='graph-')
+        path = os.path.join(folder, 'graph.snap')
+        save_directed(graph, path)
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,))
+    sources = iter(sources)
+    window = deque()
+
+    def submit() -> None:
+        chunk = list(itertools.islice(sources, chunksize))
+        if len(chunk) > 0:
+            window.append(executor.submit(_distances, chunk))
+
+    try:
+        for _ in range(2 * workers):
+            submit()
+        while len(window) > 0:
+            rows = window.popleft().result()
+            # a chunk was taken off the window, the workers may start one more
+            submit()
+            yield from rows
+    finally:
+        # stopping early drops the work that has not started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+        if folder is not None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def _init_worker(path: str) -> None:
+    """
+    Map the shared snapshot once per worker process
+    """
+    global _worker_graph
+    _worker_graph = load_directed(path)
+
+
+def _distances(chunk: []) -> []:
+    """
+    Return list of (src, distances) for the sources in chunk, computed in the worker process
+    """
+    return [(src, _worker_graph.dijkstra(src)) for src in chunk]
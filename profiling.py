@@ -0,0 +1,268 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Opt-in instrumentation for graph queries. While a Profiler is attached to a graph,
+# its neighbour hooks are swapped for counting wrappers, so every profiled call reports vertices
+# settled, edges relaxed, peak frontier, wall time and allocations. Detached graphs run the plain
+# methods: the only cost left is one attribute check per query call.
+
+import functools
+import sys
+import time
+import tracemalloc
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+# per-call counters that are summed when aggregating; the others keep their maximum
+SUMMED = ('seconds', 'settled', 'relaxed', 'blocks')
+MAXED = ('peak_frontier', 'peak_bytes')
+
+
+class Profiler:
+    """
+    Collects per-call stats of profiled graph queries and aggregates them by method
+    - callback(record) is called with the stats dict of every profiled call
+    - trace_memory also records peak traced memory (tracemalloc slows calls down)
+    """
+
+    def __init__(self, callback=None, trace_memory=False):
+        """
+        Store callback and start with empty totals
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self._totals = dict()
+        self._active = set()
+
+    @contextmanager
+    def attach(self, *graphs):
+        """
+        Profile the given graphs for the duration of a with block
+        """
+        previous = [graph._profiler for graph in graphs]
+        for graph in graphs:
+            graph._profiler = self
+        try:
+            yield self
+        finally:
+            for graph, profiler in zip(graphs, previous):
+                graph._profiler = profiler
+
+    def run(self, graph, method, args, kwargs):
+        """
+        Call method on graph with counting hooks installed and record its stats
+        """
+        # queries calling other profiled queries are counted as part of the outer call
+        if id(graph) in self._active:
+            return method(graph, *args, **kwargs)
+
+        probe = _Probe()
+        installed = probe.install(graph)
+        self._active.add(id(graph))
+        traced = self.trace_memory and not tracemalloc.is_tracing()
+        if traced:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            result = method(graph, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if traced:
+                tracemalloc.stop()
+            probe.uninstall(graph, installed)
+            self._active.discard(id(graph))
+
+        record = {'method': method.__name__, 'graph': type(graph).__name__, 'seconds': seconds,
+                  'settled': probe.settled, 'relaxed': probe.relaxed,
+                  'peak_frontier': probe.peak_frontier, 'blocks': blocks, 'peak_bytes': peak}
+        self.record(record)
+        return result
+
+    def record(self, record: dict) -> None:
+        """
+        Add one call's stats to the totals of its method and pass it to the callback
+        """
+        totals = self._totals.get(record['method'])
+        if totals is None:
+            totals = {'calls': 0, 'max_seconds': 0.0}
+            totals.update((field, 0) for field in SUMMED)
+            totals.update((field, None) for field in MAXED)
+            self._totals[record['method']] = totals
+
+        totals['calls'] += 1
+        totals['max_seconds'] = max(totals['max_seconds'], record['seconds'])
+        for field in SUMMED:
+            totals[field] += record[field]
+        for field in MAXED:
+            if record[field] is not None:
+                totals[field] = max(totals[field] or 0, record[field])
+
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self) -> dict:
+        """
+        Return dict of method -> aggregated stats (sums, maxima and mean seconds per call)
+        """
+        summary = dict()
+        for method, totals in self._totals.items():
+            summary[method] = dict(totals, mean_seconds=totals['seconds'] / totals['calls'])
+        return summary
+
+    def export(self, prefix='graph') -> dict:
+        """
+        Return the summary flattened to {'<prefix>.<method>.<stat>': value},
+        ready to push to a metrics backend
+        """
+        return {f'{prefix}.{method}.{field}': value
+                for method, stats in self.summary().items()
+                for field, value in stats.items() if value is not None}
+
+    def reset(self) -> None:
+        """
+        Drop all aggregated stats
+        """
+        self._totals.clear()
+
+
+def profiled(method):
+    """
+    Decorate a graph query method so it reports to the graph's profiler, if one is attached
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = self._profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        return profiler.run(self, method, args, kwargs)
+
+    return wrapper
+
+
+class _Probe:
+    """
+    Counters of one profiled call, fed by wrappers around the graph's neighbour hooks
+    - settled: vertices whose neighbours were read
+    - relaxed: neighbour entries (edges) read
+    - peak_frontier: most vertices seen as a neighbour but not settled yet, at any time
+    """
+
+    def __init__(self):
+        self.settled = 0
+        self.relaxed = 0
+        self.peak_frontier = 0
+        self.muted = False
+        # hook name -> (vertices seen, vertices settled)
+        self._sides = dict()
+
+    def install(self, graph) -> []:
+        """
+        Shadow the graph's neighbour hooks with counting wrappers, return what was installed
+        """
+        installed = list()
+        for name, pairs in graph._expansion_hooks:
+            setattr(graph, name, self._wrap(name, getattr(graph, name), pairs))
+            installed.append(name)
+        # UndirectedGraph algorithms also read adj_list directly
+        if isinstance(vars(graph).get('adj_list'), dict):
+            graph.adj_list = _CountingAdjacency(graph.adj_list, self)
+            installed.append('adj_list')
+        return installed
+
+    def uninstall(self, graph, installed: []) -> None:
+        """
+        Restore the hooks replaced by install()
+        """
+        for name in installed:
+            if name == 'adj_list':
+                graph.adj_list = graph.adj_list.mapping
+            else:
+                delattr(graph, name)
+
+    def expand(self, side: str, vertex, neighbors, pairs: bool) -> None:
+        """
+        Count vertex as settled through the hook side, with its neighbours relaxed
+        """
+        self.settled += 1
+        self.relaxed += len(neighbors)
+        seen, settled = self._sides.setdefault(side, (set(), set()))
+        seen.add(vertex)
+        settled.add(vertex)
+        if pairs:
+            seen.update(neighbor[0] for neighbor in neighbors)
+        else:
+            seen.update(neighbors)
+        frontier = sum(len(seen) - len(settled) for seen, settled in self._sides.values())
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+
+    def _wrap(self, name: str, hook, pairs: bool):
+        """
+        Return counting wrapper around a neighbour hook
+        """
+        def counting(vertex):
+            # hooks built on other hooks (or on adj_list) count once
+            if self.muted:
+                return hook(vertex)
+            self.muted = True
+            try:
+                neighbors = hook(vertex)
+            finally:
+                self.muted = False
+            self.expand(name, vertex, neighbors, pairs)
+            return neighbors
+
+        return counting
+
+
+class _CountingAdjacency(Mapping):
+    """
+    Read-only view of an adjacency dict that counts neighbour lookups on a _Probe
+    """
+
+    def __init__(self, mapping: dict, probe: _Probe):
+        self.mapping = mapping
+        self.probe = probe
+
+    def __getitem__(self, vertex):
+        neighbors = self.mapping[vertex]
+        if not self.probe.muted:
+            self.probe.expand('adj_list', vertex, neighbors, False)
+        return neighbors
+
+    def __contains__(self, vertex):
+        return vertex in self.mapping
+
+    def __iter__(self):
+        return iter(self.mapping)
+
+    def __len__(self):
+        return len(self.mapping)
+
+
+if __name__ == '__main__':
+
+    from d_graph import DirectedGraph
+    from ud_graph import UndirectedGraph
+
+    print("\nPDF - Profiler example 1")
+    print("------------------------")
+    fields = ('settled', 'relaxed', 'peak_frontier')
+    g = DirectedGraph([(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+                       (3, 1, 5), (2, 1, 23), (3, 2, 7)])
+    u = UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG'])
+    profiler = Profiler(callback=lambda record: print(record['graph'], record['method'],
+                                                      [record[field] for field in fields]))
+    with profiler.attach(g, u):
+        g.dijkstra(0)
+        g.shortest_path(0, 2, bidirectional=True)
+        g.has_cycle()
+        u.bfs('A')
+        u.count_connected_components()
+    for method, stats in profiler.summary().items():
+        print(method, stats['calls'], [stats[field] for field in fields])
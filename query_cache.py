@@ -0,0 +1,122 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Opt-in LRU cache for graph queries. Results are keyed by (method, arguments, graph
+# version); every edit bumps the graph version, so a stale result is never served.
+
+import copy
+import functools
+import sys
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results with hit / miss / eviction counters
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Store at most maxsize results
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        self.version = None
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """
+        Return number of cached results
+        """
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Return cached result for key (marking it most recently used), default if absent
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        return default
+
+    def put(self, key, result) -> None:
+        """
+        Store result for key, evicting least recently used results beyond maxsize
+        """
+        if self.maxsize <= 0:
+            return
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        size = _footprint(result)
+        self._entries[key] = (result, size)
+        self.bytes += size
+        while len(self._entries) > self.maxsize:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def expire(self, version) -> None:
+        """
+        Drop every result cached for an older graph version
+        """
+        if version != self.version:
+            self.invalidations += len(self._entries)
+            self.clear()
+            self.version = version
+
+    def clear(self) -> None:
+        """
+        Drop every cached result (counters are kept)
+        """
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return counters, hit rate and approximate memory footprint in bytes
+        """
+        lookups = self.hits + self.misses
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0, 'bytes': self.bytes}
+
+
+def cached_query(method):
+    """
+    Decorate a graph query method so it goes through the graph's query cache, if enabled
+    (callers get a copy, so editing a returned list cannot corrupt the cache)
+    """
+    missing = object()
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self._query_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        cache.expire(self._version)
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), self._version)
+        result = cache.get(key, missing)
+        if result is missing:
+            result = method(self, *args, **kwargs)
+            cache.put(key, result)
+        return copy.copy(result)
+
+    return wrapper
+
+
+def _footprint(result) -> int:
+    """
+    Return approximate size in bytes of result and the items it directly holds
+    """
+    size = sys.getsizeof(result)
+    if isinstance(result, (list, tuple)):
+        size += sum(sys.getsizeof(item) for item in result)
+    return size
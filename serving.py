@@ -0,0 +1,254 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Asyncio front end for graph queries. Queries run in an executor so the event loop
+# never blocks, at most max_concurrency at a time. Identical queries in flight (same method,
+# arguments and graph version) share one computation, a full queue rejects new work instead of
+# growing without bound, and every caller can give up after its own timeout. With a process pool,
+# workers read the graph from a snapshot instead of sharing the object.
+
+import asyncio
+import copy
+import functools
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from d_graph import DirectedGraph
+from snapshot import is_mapped, load_directed, load_undirected, save_directed, save_undirected
+
+# graph methods that only read the graph; edits and other methods are not served
+QUERIES = frozenset(('all_pairs_shortest_paths', 'astar', 'bfs', 'component_of', 'condensation',
+                     'count_connected_components', 'count_strongly_connected_components',
+                     'dag_paths', 'dfs', 'dijkstra', 'get_edges', 'get_vertices', 'has_cycle',
+                     'is_valid_path', 'multi_bfs', 'same_component', 'shortest_path',
+                     'strongly_connected_components', 'topological_order'))
+
+# (snapshot path, graph loaded from it) in a worker process of a ProcessPoolExecutor
+_worker_snapshot = (None, None)
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a query arrives while max_pending computations are already queued or running
+    """
+
+
+class QueryServer:
+    """
+    Class to serve queries on one graph from asyncio code
+    - await server.query('dijkstra', 0) runs graph.dijkstra(0) off the event loop
+    - only the read-only methods in QUERIES are served, and the graph must not be edited
+      while queries are running
+    - on a ProcessPoolExecutor each graph version is written once to a snapshot that every
+      worker loads on its first query; the graph's profiler and query cache are not used there
+    """
+
+    def __init__(self, graph, max_concurrency=4, max_pending=256, timeout=None, executor=None):
+        """
+        Store graph and limits; executor defaults to a thread pool of max_concurrency threads,
+        a passed-in one must be a ThreadPoolExecutor or a ProcessPoolExecutor
+        (and is not shut down by close())
+        """
+        pools = (ThreadPoolExecutor, ProcessPoolExecutor)
+        if executor is not None and not isinstance(executor, pools):
+            raise TypeError(f'executor must be a ThreadPoolExecutor or a ProcessPoolExecutor, '
+                            f'not {type(executor).__name__}')
+        self.graph = graph
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._own_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix='graph-query')
+        self._executor = executor
+        self._processes = isinstance(executor, ProcessPoolExecutor)
+        self._slots = None
+        self._serial = threading.Lock()
+        # snapshots written for process workers: folder, (graph version, path) of the latest
+        self._folder = None
+        self._snapshot = (None, None)
+        # (method, args, kwargs, graph version) -> task computing it
+        self._in_flight = dict()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def query(self, method: str, *args, timeout=None, **kwargs):
+        """
+        Return graph.method(*args, **kwargs), computed in the executor
+        - joins an identical query already in flight instead of starting another
+        - raises Overloaded if max_pending computations are queued or running
+        - raises asyncio.TimeoutError after timeout seconds (default: the server timeout);
+          the computation keeps running for the other callers waiting on it
+        """
+        if method not in QUERIES or not callable(getattr(self.graph, method, None)):
+            raise AttributeError(f'{type(self.graph).__name__} has no read-only query {method!r}')
+        self.requests += 1
+
+        key = (method, args, tuple(sorted(kwargs.items())), self.graph._version)
+        try:
+            task = self._in_flight.get(key)
+        except TypeError:
+            # unhashable arguments (e.g. a list of sources) are never coalesced
+            key = None
+            task = None
+
+        if task is None:
+            task = self._start(key, method, args, kwargs)
+        else:
+            self.coalesced += 1
+
+        try:
+            # shield: a caller timing out must not cancel the computation others wait on
+            result = await asyncio.wait_for(asyncio.shield(task),
+                                            self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        # callers get a deep copy (nested lists and dicts, tuples, the condensation graph), so
+        # one of them editing its result cannot affect the others or the graph's query cache
+        return copy.deepcopy(result)
+
+    def stats(self) -> dict:
+        """
+        Return request counters and number of computations in flight
+        """
+        return {'requests': self.requests, 'computations': self.computations,
+                'coalesced': self.coalesced, 'rejected': self.rejected,
+                'timeouts': self.timeouts, 'in_flight': len(self._in_flight)}
+
+    async def close(self) -> None:
+        """
+        Wait for the computations in flight, then shut down the executor if we created it
+        """
+        pending = list(self._in_flight.values())
+        if len(pending) > 0:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+        if self._folder is not None:
+            shutil.rmtree(self._folder, ignore_errors=True)
+            self._folder = None
+
+    # ------------------------------------------------------------------ #
+
+    def _start(self, key, method: str, args, kwargs):
+        """
+        Return task computing the query, registered under key while it runs
+        """
+        if len(self._in_flight) >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded(f'{len(self._in_flight)} queries in flight (max_pending={self.max_pending})')
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        task = asyncio.ensure_future(self._compute(method, args, kwargs))
+        # unhashable queries are tracked under the task itself
+        key = task if key is None else key
+        self._in_flight[key] = task
+
+        def finished(done):
+            self._in_flight.pop(key, None)
+            # mark a failure as seen even if every caller timed out before it
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(finished)
+        return task
+
+    async def _compute(self, method: str, args, kwargs):
+        """
+        Run the query in the executor once a concurrency slot is free
+        """
+        async with self._slots:
+            self.computations += 1
+            if self._processes:
+                path = self._snapshot_path()
+                if isinstance(self.graph, DirectedGraph):
+                    loader = load_directed
+                else:
+                    loader = load_undirected
+                call = functools.partial(_run_snapshot, path, loader, method, args, kwargs)
+            else:
+                call = functools.partial(self._run, method, args, kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _snapshot_path(self) -> str:
+        """
+        Return path of a snapshot of the current graph version, writing it if needed
+        """
+        graph = self.graph
+        version, path = self._snapshot
+        if version == graph._version:
+            return path
+        if is_mapped(graph):
+            path = graph._snapshot_path
+        else:
+            # older snapshots stay until close(), queries in flight may still be loading them
+            if self._folder is None:
+                self._folder = tempfile.mkdtemp(prefix='graph-query-')
+            path = os.path.join(self._folder, f'graph-{graph._version}.snap')
+            if isinstance(graph, DirectedGraph):
+                save_directed(graph, path)
+            else:
+                save_undirected(graph, path)
+        self._snapshot = (graph._version, path)
+        return path
+
+    def _run(self, method: str, args, kwargs):
+        """
+        Return result of the query, called in an executor thread
+        """
+        graph = self.graph
+        query = getattr(graph, method)
+        # the profiler swaps the graph's neighbour hooks and the query cache reorders its
+        # entries on every call, so with either enabled queries run one at a time
+        if graph._profiler is None and graph._query_cache is None:
+            return query(*args, **kwargs)
+        with self._serial:
+            return query(*args, **kwargs)
+
+
+def _run_snapshot(path: str, loader, method: str, args, kwargs):
+    """
+    Return result of the query on the graph snapshot at path, called in a worker process
+    (the graph is loaded once per worker and snapshot)
+    """
+    global _worker_snapshot
+    if _worker_snapshot[0] != path:
+        _worker_snapshot = (path, loader(path))
+    return getattr(_worker_snapshot[1], method)(*args, **kwargs)
+
+
+if __name__ == '__main__':
+
+    from ud_graph import UndirectedGraph
+
+    async def main():
+        print("\nPDF - QueryServer example 1")
+        print("---------------------------")
+        edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+                 (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+        async with QueryServer(DirectedGraph(edges), max_concurrency=2) as server:
+            # ten identical requests arrive together, one dijkstra runs
+            results = await asyncio.gather(*[server.query('dijkstra', 0) for _ in range(10)])
+            print(results[0], server.stats())
+            print(await asyncio.gather(*[server.query('dijkstra', i) for i in range(5)]))
+
+        async with QueryServer(UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH',
+                                                'QG', 'FG'])) as server:
+            print(await server.query('bfs', 'A'), await server.query('multi_bfs', ['A', 'G']))
+            print(server.stats())
+
+    asyncio.run(main())
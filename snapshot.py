@@ -0,0 +1,267 @@
+# Course: CS261 - Data Structures
+# Author: Justin Quach-Law
+# Assignment: Assignment 6 - Portfolio Project
+# Description: Compact binary snapshot format for the graph classes. A snapshot holds a header, a
+# vertex-ID table, CSR offsets, targets and weights. Directed snapshots are loaded through mmap,
+# so traversals and dijkstra read straight from the mapped file and processes share one copy.
+# Contraction hierarchies are stored the same way, so query workers map a hierarchy built once.
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from contraction import ContractionHierarchy
+from csr_graph import CSRDirectedGraph, _typecode
+from ud_graph import UndirectedGraph
+
+# magic, version, kind, byte order, weight typecode, v_count, e_count, label table bytes
+HEADER = struct.Struct('<8sHBcc3xqqq')
+MAGIC = b'GRAPHSNP'
+VERSION = 1
+DIRECTED = 0
+UNDIRECTED = 1
+HIERARCHY = 2
+BYTE_ORDER = b'L' if sys.byteorder == 'little' else b'B'
+
+
+def save_directed(graph, path: str) -> None:
+    """
+    Write DirectedGraph (dense or CSR) to path as a snapshot
+    """
+    if isinstance(graph, CSRDirectedGraph):
+        sources, targets, weights = graph._edge_arrays()
+    else:
+        sources, targets, weights = array('i'), array('i'), array('q')
+        for src, dst, weight in graph.get_edges():
+            if weights.typecode == 'q' and not isinstance(weight, int):
+                weights = array('d', weights)
+            sources.append(src)
+            targets.append(dst)
+            weights.append(weight)
+
+    offsets = array('q', bytes(8 * (graph.v_count + 1)))
+    for src in sources:
+        offsets[src + 1] += 1
+    for index in range(graph.v_count):
+        offsets[index + 1] += offsets[index]
+
+    # vertex IDs of a directed graph are 0 .. v_count - 1, so its ID table is empty
+    header = HEADER.pack(MAGIC, VERSION, DIRECTED, BYTE_ORDER, weights.typecode.encode(),
+                         graph.v_count, len(targets), 0)
+    _write(path, header, (offsets, targets, weights))
+
+
+def load_directed(path: str) -> CSRDirectedGraph:
+    """
+    Return CSRDirectedGraph whose CSR arrays are read-only views into the mmapped snapshot
+    (the first edit copies them into memory, see is_mapped)
+    """
+    mapping, kind, code, v_count, e_count, label_bytes, position = _open(path)
+    if kind != DIRECTED:
+        raise ValueError(f'{path} is not a directed graph snapshot')
+
+    view = memoryview(mapping)
+    offsets, position = _section(view, position, 'q', v_count + 1)
+    targets, position = _section(view, position, 'i', e_count)
+    weights, position = _section(view, position, code, e_count)
+
+    graph = CSRDirectedGraph()
+    graph.v_count = v_count
+    graph._offsets = offsets
+    graph._targets = targets
+    graph._weights = weights
+    graph._mapping = mapping
+    graph._snapshot_path = os.path.abspath(path)
+    graph._snapshot_version = graph._version
+    return graph
+
+
+def is_mapped(graph) -> bool:
+    """
+    Return True if graph still reads every edge from the snapshot it was loaded from
+    (it has not been edited since)
+    """
+    return (getattr(graph, '_snapshot_path', None) is not None
+            and isinstance(graph, CSRDirectedGraph)
+            and graph._version == graph._snapshot_version
+            and not isinstance(graph._targets, array)
+            and not isinstance(graph._offsets, array)
+            and len(graph._pending) == 0)
+
+
+def save_undirected(graph, path: str) -> None:
+    """
+    Write UndirectedGraph to path as a snapshot (labels are stored as UTF-8 strings)
+    """
+    labels = list(graph.adj_list)
+    ids = {label: index for index, label in enumerate(labels)}
+
+    label_offsets = array('q', [0])
+    blob = bytearray()
+    for label in labels:
+        blob += str(label).encode('utf-8')
+        label_offsets.append(len(blob))
+
+    # each vertex keeps its neighbours in adjacency-list order
+    offsets = array('q', [0])
+    targets = array('i')
+    for label in labels:
+        targets.extend(ids[neighbor] for neighbor in graph.adj_list[label])
+        offsets.append(len(targets))
+
+    label_table = label_offsets.tobytes() + bytes(blob)
+    header = HEADER.pack(MAGIC, VERSION, UNDIRECTED, BYTE_ORDER, b'n',
+                         len(labels), len(targets), len(label_table))
+    _write(path, header, (label_table, offsets, targets))
+
+
+def load_undirected(path: str) -> UndirectedGraph:
+    """
+    Return UndirectedGraph read from the snapshot
+    (adj_list is a dict of neighbour sets, so it is built from the mapped buffers)
+    """
+    mapping, kind, _, v_count, e_count, label_bytes, position = _open(path)
+    if kind != UNDIRECTED:
+        raise ValueError(f'{path} is not an undirected graph snapshot')
+
+    view = memoryview(mapping)
+    label_offsets, _ = _section(view, position, 'q', v_count + 1)
+    blob = view[position + 8 * (v_count + 1):position + label_bytes]
+    labels = [str(blob[label_offsets[index]:label_offsets[index + 1]], 'utf-8')
+              for index in range(v_count)]
+    position = _align(position + label_bytes)
+    offsets, position = _section(view, position, 'q', v_count + 1)
+    targets, position = _section(view, position, 'i', e_count)
+
+    graph = UndirectedGraph()
+    for index, label in enumerate(labels):
+        neighbors = graph.neighbor_set()
+        for target in targets[offsets[index]:offsets[index + 1]]:
+            neighbors.add(labels[target])
+        graph.adj_list[label] = neighbors
+
+    # buffers were copied, the file can be released
+    label_offsets.release()
+    blob.release()
+    offsets.release()
+    targets.release()
+    view.release()
+    mapping.close()
+    return graph
+
+
+def save_hierarchy(hierarchy, path: str) -> None:
+    """
+    Write ContractionHierarchy to path as a snapshot
+    """
+    code = _typecode(hierarchy.up[2])
+    e_count = len(hierarchy.up[1]) + len(hierarchy.down[1])
+    header = HEADER.pack(MAGIC, VERSION, HIERARCHY, BYTE_ORDER, code.encode(),
+                         hierarchy.v_count, e_count, 0)
+    _write(path, header, (hierarchy.rank,) + tuple(hierarchy.up) + tuple(hierarchy.down))
+
+
+def load_hierarchy(path: str) -> ContractionHierarchy:
+    """
+    Return ContractionHierarchy whose arrays are read-only views into the mmapped snapshot
+    """
+    mapping, kind, code, v_count, e_count, label_bytes, position = _open(path)
+    if kind != HIERARCHY:
+        raise ValueError(f'{path} is not a contraction hierarchy snapshot')
+
+    view = memoryview(mapping)
+    rank, position = _section(view, position, 'i', v_count)
+    halves = list()
+    for _ in range(2):
+        offsets, position = _section(view, position, 'q', v_count + 1)
+        vertices, position = _section(view, position, 'i', offsets[v_count])
+        weights, position = _section(view, position, code, offsets[v_count])
+        middles, position = _section(view, position, 'i', offsets[v_count])
+        halves.append((offsets, vertices, weights, middles))
+
+    hierarchy = ContractionHierarchy(rank, halves[0], halves[1])
+    hierarchy._mapping = mapping
+    return hierarchy
+
+
+def _write(path: str, header: bytes, sections) -> None:
+    """
+    Write header and sections, padding each section to 8-byte alignment
+    """
+    with open(path, 'wb') as file:
+        file.write(header)
+        written = len(header)
+        for section in sections:
+            data = memoryview(section).cast('B')
+            file.write(data)
+            written += len(data)
+            padding = _align(written) - written
+            file.write(bytes(padding))
+            written += padding
+
+
+def _open(path: str):
+    """
+    Return (mapping, kind, weight typecode, v_count, e_count, label table bytes, first section offset)
+    """
+    with open(path, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, kind, order, code, v_count, e_count, label_bytes = HEADER.unpack_from(mapping)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a graph snapshot')
+    if version != VERSION:
+        raise ValueError(f'{path} has unsupported snapshot version {version}')
+    if order != BYTE_ORDER:
+        raise ValueError(f'{path} was written on a machine with a different byte order')
+
+    return mapping, kind, code.decode(), v_count, e_count, label_bytes, _align(HEADER.size)
+
+
+def _section(view, position: int, code: str, count: int):
+    """
+    Return (typed view of count items at position, offset of the next section)
+    """
+    end = position + array(code).itemsize * count
+    return view[position:end].cast(code), _align(end)
+
+
+def _align(position: int) -> int:
+    """
+    Return position rounded up to a multiple of 8
+    """
+    return (position + 7) // 8 * 8
+
+
+if __name__ == '__main__':
+
+    import tempfile
+
+    from d_graph import DirectedGraph
+
+    print("\nPDF - snapshot save / load example 1")
+    print("------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    folder = tempfile.mkdtemp()
+    d_path = os.path.join(folder, 'directed.snap')
+    save_directed(DirectedGraph(edges), d_path)
+    g = load_directed(d_path)
+    print(g.get_edges())
+    for i in range(5):
+        print(f'DIJKSTRA {i} {g.dijkstra(i)}')
+
+    ud_path = os.path.join(folder, 'undirected.snap')
+    save_undirected(UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']), ud_path)
+    g = load_undirected(ud_path)
+    print(g)
+    print(g.bfs('A'), g.count_connected_components())
+
+    ch_path = os.path.join(folder, 'hierarchy.snap')
+    save_hierarchy(DirectedGraph(edges).contraction_hierarchy(), ch_path)
+    ch = load_hierarchy(ch_path)
+    for i in range(5):
+        print(f'CH {i} {[ch.distance(i, j) for j in range(5)]}')
+    print(ch.shortest_path(0, 2))
@@ -5,8 +5,44 @@
 # It also performs depth-first search, breadth-first search and checks if graph is cyclic.
 
 import heapq
+from bisect import bisect_left, insort
 from collections import deque
 
+from profiling import Profiler, profiled
+from query_cache import QueryCache, cached_query
+
+
+class NeighborSet(dict):
+    """
+    Insertion-ordered hashed set of neighbours
+    - O(1) add, discard, remove and membership
+    - iterates and prints like the list it replaces
+    """
+
+    def add(self, item) -> None:
+        """
+        Add item (no-op if already present)
+        """
+        self[item] = None
+
+    def discard(self, item) -> None:
+        """
+        Remove item if present
+        """
+        self.pop(item, None)
+
+    def remove(self, item) -> None:
+        """
+        Remove item, raise KeyError if not present
+        """
+        del self[item]
+
+    def __repr__(self):
+        """
+        Return content in list form
+        """
+        return repr(list(self))
+
 
 class UndirectedGraph:
     """
@@ -17,6 +53,30 @@ class UndirectedGraph:
     - vertex names are strings
     """
 
+    # container used for each neighbour collection: NeighborSet keeps insertion
+    # order, set it to the builtin set for a plain (unordered) hashed mode
+    neighbor_set = NeighborSet
+
+    # union-find component index, built on first query and kept up to date on
+    # insertions; removals drop it so the next query rebuilds it
+    _components = None
+
+    # vertex -> its neighbours in ascending order, filled on first visit and kept
+    # sorted through bisect on every edge insert / delete
+    _sorted = None
+
+    # bumped by every edit, so cached query results of an older graph are never served
+    _version = 0
+
+    # optional LRU cache of query results, see enable_query_cache()
+    _query_cache = None
+
+    # optional Profiler collecting per-call stats, see enable_profiling()
+    _profiler = None
+
+    # neighbour hooks the profiler counts through (adj_list lookups are counted as well)
+    _expansion_hooks = (('_sorted_neighbors', False),)
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency list
@@ -49,7 +109,10 @@ class UndirectedGraph:
         Add new vertex to the graph
         """
         if v not in self.adj_list:
-            self.adj_list[v] = list()
+            self.adj_list[v] = self.neighbor_set()
+            self._version += 1
+            if self._components is not None:
+                self._components.add(v)
 
     def add_edge(self, u: str, v: str) -> None:
         """
@@ -60,15 +123,44 @@ class UndirectedGraph:
 
         # if vertex dont exist
         if u not in self.adj_list:
-            self.adj_list[u] = list()
+            self.adj_list[u] = self.neighbor_set()
         if v not in self.adj_list:
-            self.adj_list[v] = list()
+            self.adj_list[v] = self.neighbor_set()
 
-        # if edge dont exist
-        if u not in self.adj_list[v]:
-            self.adj_list[v].append(u)
-        if v not in self.adj_list[u]:
-            self.adj_list[u].append(v)
+        if u in self.adj_list[v]:
+            return
+        self.adj_list[v].add(u)
+        self.adj_list[u].add(v)
+        self._version += 1
+
+        if self._sorted is not None:
+            self._sorted_insert(u, v)
+            self._sorted_insert(v, u)
+        if self._components is not None:
+            self._components.add(u)
+            self._components.add(v)
+            self._components.union(u, v)
+
+    def add_edges(self, edges) -> None:
+        """
+        Add (u, v) edges to the graph in bulk
+        """
+        adj_list = self.adj_list
+        neighbor_set = self.neighbor_set
+        for u, v in edges:
+            if u == v:
+                continue
+            if u not in adj_list:
+                adj_list[u] = neighbor_set()
+            if v not in adj_list:
+                adj_list[v] = neighbor_set()
+            adj_list[u].add(v)
+            adj_list[v].add(u)
+
+        # rebuilt on the next component query / traversal
+        self._version += 1
+        self._components = None
+        self._sorted = None
 
     def remove_edge(self, v: str, u: str) -> None:
         """
@@ -82,9 +174,15 @@ class UndirectedGraph:
 
         if v in self.adj_list[u]:
             self.adj_list[u].remove(v)
+            self._version += 1
+            self._components = None
         if u in self.adj_list[v]:
             self.adj_list[v].remove(u)
 
+        if self._sorted is not None:
+            self._sorted_delete(u, v)
+            self._sorted_delete(v, u)
+
     def remove_vertex(self, v: str) -> None:
         """
         Remove vertex and all connected edges
@@ -98,9 +196,44 @@ class UndirectedGraph:
         # in connect edges, remove given vertex, v
         for pair in list_edge:
             self.adj_list[pair].remove(v)
+            if self._sorted is not None:
+                self._sorted_delete(pair, v)
 
         # remove vertex
         self.adj_list.pop(v)
+        self._version += 1
+        self._components = None
+        if self._sorted is not None:
+            self._sorted.pop(v, None)
+
+    def enable_query_cache(self, maxsize=128) -> QueryCache:
+        """
+        Cache results of dfs, bfs and shortest_path (at most maxsize of them)
+        and return the cache, whose stats() report hit rate and memory footprint
+        """
+        self._query_cache = QueryCache(maxsize)
+        return self._query_cache
+
+    def disable_query_cache(self) -> None:
+        """
+        Stop caching query results
+        """
+        self._query_cache = None
+
+    def enable_profiling(self, profiler=None, callback=None) -> Profiler:
+        """
+        Record stats of every call to dfs, bfs, multi_bfs, shortest_path,
+        count_connected_components and has_cycle
+        on profiler (a new one reporting to callback if not given) and return it
+        """
+        self._profiler = profiler if profiler is not None else Profiler(callback)
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        """
+        Stop recording query stats
+        """
+        self._profiler = None
 
     def get_vertices(self) -> []:
         """
@@ -112,14 +245,15 @@ class UndirectedGraph:
         """
         Return list of edges in the graph (any order)
         """
-        check = list()
+        done = set()
         lst_edges = list()
 
+        # each edge is reported from whichever end is listed first
         for vertex in self.adj_list:
             for neighbor in self.adj_list[vertex]:
-                if (str(vertex), neighbor) not in check:
+                if neighbor not in done:
                     lst_edges.append((str(vertex), neighbor))
-                    check.append((neighbor, str(vertex)))
+            done.add(vertex)
 
         return lst_edges
 
@@ -148,130 +282,330 @@ class UndirectedGraph:
 
         return True
 
+    @profiled
+    @cached_query
     def dfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during DFS search
         Vertices are picked in alphabetical order
         """
-        visited = list()
-        lst_vertices = list(self.adj_list)
-        if v_start not in lst_vertices:
-            return visited
+        return list(self.iter_dfs(v_start, v_end))
 
+    @profiled
+    @cached_query
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Return list of vertices visited during BFS search
+        Vertices are picked in alphabetical order
+        """
+        return list(self.iter_bfs(v_start, v_end))
+
+    def iter_dfs(self, v_start, v_end=None, with_info=False):
+        """
+        Yield vertices in the order dfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
+        """
+        if v_start not in self.adj_list:
+            return
+
+        # hashed set of visited vertices; info runs parallel to stack, only when asked for
+        seen = set()
         stack = deque(list())
         stack.append(v_start)
+        info = deque(list())
+        info.append((0, None))
         while len(stack) > 0:
             pick = stack.pop()
-            if pick not in visited:
-                visited.append(pick)
+            if with_info:
+                depth, parent = info.pop()
+            if pick not in seen:
+                seen.add(pick)
+                yield (pick, depth, parent) if with_info else pick
                 if pick == v_end:
-                    return visited
-
-                # sorting successors in ascending order
-                to_sort = list()
-                for successor in self.adj_list[pick]:
-                    to_sort.append(successor)
-                to_sort.sort()
-                # appending popped succesors, creating descending order to stack
-                # (thus pop from stack in ascending order)
-                while len(to_sort) > 0:
-                    stack.append(to_sort.pop())
+                    return
 
-        return visited
+                # appending successors in descending order to stack
+                # (thus pop from stack in ascending order)
+                successors = self._sorted_neighbors(pick)
+                stack.extend(reversed(successors))
+                if with_info:
+                    info.extend([(depth + 1, pick)] * len(successors))
 
-    def bfs(self, v_start, v_end=None) -> []:
+    def iter_bfs(self, v_start, v_end=None, with_info=False):
         """
-        Return list of vertices visited during BFS search
-        Vertices are picked in alphabetical order
+        Yield vertices in the order bfs visits them, or (vertex, depth, parent) tuples
+        if with_info is True; the search only advances as the caller iterates
         """
-        visited = list()
-        lst_vertices = list(self.adj_list)
-        if v_start not in lst_vertices:
-            return visited
+        if v_start not in self.adj_list:
+            return
 
+        # hashed set of vertices already visited or waiting in the queue
+        seen = {v_start}
         queue = deque(list())
-        queue.append(v_start)
+        queue.append((v_start, 0, None))
         while len(queue) > 0:
-            pick = queue.popleft()
-            visited.append(pick)
+            pick, depth, parent = queue.popleft()
+            yield (pick, depth, parent) if with_info else pick
             if pick == v_end:
-                return visited
-
-            to_sort = list()
-            for successor in self.adj_list[pick]:
-                to_sort.append(successor)
-            to_sort.sort()
+                return
 
-            for sorted_successor in to_sort:
-                if sorted_successor not in visited:
-                    if sorted_successor not in queue:
-                        queue.append(sorted_successor)
+            for sorted_successor in self._sorted_neighbors(pick):
+                if sorted_successor not in seen:
+                    seen.add(sorted_successor)
+                    queue.append((sorted_successor, depth + 1, pick))
 
-        return visited
+    @profiled
+    @cached_query
+    def shortest_path(self, v_start, v_end) -> []:
+        """
+        Return list of vertices on a shortest path from v_start to v_end,
+        empty list if there is none
+        Runs a meet-in-the-middle BFS that grows the smaller frontier one level at a time
+        """
+        if v_start not in self.adj_list or v_end not in self.adj_list:
+            return list()
+        if v_start == v_end:
+            return [v_start]
+
+        # index 0: search from v_start, index 1: search from v_end
+        parents = ({v_start: None}, {v_end: None})
+        frontiers = ([v_start], [v_end])
+        meet = None
+        while meet is None and len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own = parents[side]
+            other = parents[1 - side]
+            next_frontier = list()
+            for vertex in frontiers[side]:
+                for neighbor in self.adj_list[vertex]:
+                    if neighbor in own:
+                        continue
+                    own[neighbor] = vertex
+                    if neighbor in other:
+                        meet = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meet is not None:
+                    break
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+        if meet is None:
+            return list()
+
+        path = [meet]
+        while parents[0][path[-1]] is not None:
+            path.append(parents[0][path[-1]])
+        path.reverse()
+        while parents[1][path[-1]] is not None:
+            path.append(parents[1][path[-1]])
+
+        return path
+
+    @profiled
+    def multi_bfs(self, sources, batch_size=256) -> dict:
+        """
+        Return dict of source -> {vertex: hops from source} over the vertices reachable
+        from source, listed by hops, ties in ascending order
+        (hop distances only: inside a level this is not the order bfs(source) visits in,
+        which would need per-source work on every edge and undo the batching)
+        Runs one BFS per batch of sources: each vertex holds a bitmask of the sources that
+        reached it, so an edge is scanned once per batch instead of once per source
+        """
+        result = {source: dict() for source in sources}
+        unique = list(result)
+        for start in range(0, len(unique), batch_size):
+            self._multi_bfs_batch(unique[start:start + batch_size], result)
+        return result
 
+    def _multi_bfs_batch(self, batch: [], result: dict) -> None:
+        """
+        Fill result[source] for every source in batch; bit i of a mask stands for batch[i]
+        """
+        adj_list = self.adj_list
+        batch = [source for source in batch if source in adj_list]
+        hops = [result[source] for source in batch]
+        frontier = {source: 1 << index for index, source in enumerate(batch)}
+        seen = dict(frontier)
+        for source in batch:
+            result[source][source] = 0
+
+        level = 0
+        while len(frontier) > 0:
+            level += 1
+            # sources reaching each neighbour of the frontier for the first time
+            reached = dict()
+            for vertex, mask in frontier.items():
+                for neighbor in adj_list[vertex]:
+                    new = mask & ~seen.get(neighbor, 0)
+                    if new:
+                        reached[neighbor] = reached.get(neighbor, 0) | new
+
+            # each level is listed in ascending order
+            frontier = dict()
+            for vertex in sorted(reached):
+                new = reached[vertex]
+                seen[vertex] = seen.get(vertex, 0) | new
+                frontier[vertex] = new
+                while new:
+                    bit = new & -new
+                    hops[bit.bit_length() - 1][vertex] = level
+                    new ^= bit
+
+    @profiled
     def count_connected_components(self):
         """
         Return number of connected components in the graph
         """
-        count = 0
-        lst_vertices = list(self.adj_list)
-        while len(lst_vertices) > 0:
-            start = lst_vertices[0]
-            component = self.bfs(start)
-            count += 1
-            for vertex in component:
-                if vertex in lst_vertices:
-                    lst_vertices.remove(vertex)
-        return count
+        return self._component_index().count
 
-    def has_cycle(self):
+    def same_component(self, u: str, v: str) -> bool:
+        """
+        Return True if u and v are in the same connected component, False otherwise
+        """
+        if u not in self.adj_list or v not in self.adj_list:
+            return False
+        components = self._component_index()
+        return components.find(u) == components.find(v)
+
+    def component_of(self, v: str):
+        """
+        Return representative vertex of the connected component containing v,
+        None if v is not in the graph
+        """
+        if v not in self.adj_list:
+            return None
+        return self._component_index().find(v)
+
+    def _sorted_neighbors(self, v: str) -> []:
+        """
+        Return neighbours of v in ascending order (shared list, do not modify)
+        """
+        if self._sorted is None:
+            self._sorted = dict()
+        neighbors = self._sorted.get(v)
+        if neighbors is None:
+            neighbors = sorted(self.adj_list[v])
+            self._sorted[v] = neighbors
+        return neighbors
+
+    def _sorted_insert(self, v: str, neighbor: str) -> None:
+        """
+        Add neighbor to the sorted index of v (if v is indexed)
+        """
+        neighbors = self._sorted.get(v)
+        if neighbors is not None:
+            insort(neighbors, neighbor)
+
+    def _sorted_delete(self, v: str, neighbor: str) -> None:
+        """
+        Remove neighbor from the sorted index of v (if v is indexed)
+        """
+        neighbors = self._sorted.get(v)
+        if neighbors is not None:
+            index = bisect_left(neighbors, neighbor)
+            if index < len(neighbors) and neighbors[index] == neighbor:
+                neighbors.pop(index)
+
+    def _component_index(self):
+        """
+        Return the union-find component index, rebuilding it if a removal dropped it
+        """
+        if self._components is None:
+            components = DisjointSet()
+            for vertex in self.adj_list:
+                components.add(vertex)
+            for vertex in self.adj_list:
+                for neighbor in self.adj_list[vertex]:
+                    components.union(vertex, neighbor)
+            self._components = components
+        return self._components
+
+    @profiled
+    def has_cycle(self, return_cycle=False):
         """
         Return True if graph contains a cycle, False otherwise
+        If return_cycle is True, return the cycle found as a closed path
+        [v, ..., v] instead (empty list if there is none)
         """
-        index = 0
-        lst_vertices = list(self.adj_list)
-        while index < len(lst_vertices):
-
-            visited = list()
-            stack = deque(list())
-            first = lst_vertices[index]
-            excluded_first = False
-            # if list is not empty, else
-            try:
-                second = min(self.adj_list[first])
-            except:
-                index += 1
+        visited = set()
+        for root in self.adj_list:
+            if root in visited:
                 continue
 
-            stack.append(second)
+            # parent tracking: any visited neighbour other than the parent closes a cycle
+            visited.add(root)
+            path = [root]
+            stack = [(None, iter(self.adj_list[root]))]
             while len(stack) > 0:
-                pick = stack.pop()
-                if pick not in visited:
-                    visited.append(pick)
-                    if pick == first:
-                        return True
-                    # sorting successors in ascending order
-                    to_sort = list()
-                    for successor in self.adj_list[pick]:
-                        to_sort.append(successor)
-                    to_sort.sort()
-
-                    # excluding first from stack
-                    if excluded_first is False:
-                        to_sort.remove(first)
-                        excluded_first = True
-
-                    # appending popped succesors, creating descending order to stack
-                    # (thus pop from stack in ascending order)
-                    while len(to_sort) > 0:
-                        stack.append(to_sort.pop())
-
-            index += 1
-
+                parent, successors = stack[-1]
+                for successor in successors:
+                    if successor == parent:
+                        continue
+                    if successor not in visited:
+                        visited.add(successor)
+                        stack.append((path[-1], iter(self.adj_list[successor])))
+                        path.append(successor)
+                        break
+                    if return_cycle:
+                        return path[path.index(successor):] + [successor]
+                    return True
+                else:
+                    path.pop()
+                    stack.pop()
+
+        if return_cycle:
+            return list()
         return False
 
 
 
+class DisjointSet:
+    """
+    Union-find over hashable items with union by size and path halving
+    """
+
+    def __init__(self):
+        """
+        Store parent and size of every item, and number of disjoint sets
+        """
+        self.parent = dict()
+        self.size = dict()
+        self.count = 0
+
+    def add(self, item) -> None:
+        """
+        Add item as a new singleton set (no-op if already present)
+        """
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+            self.count += 1
+
+    def find(self, item):
+        """
+        Return representative item of the set containing item
+        """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b) -> None:
+        """
+        Merge the sets containing a and b
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.count -= 1
+
+
 if __name__ == '__main__':
 
     print("\nPDF - method add_vertex() / add_edge example 1")
@@ -358,3 +692,39 @@ if __name__ == '__main__':
         u, v = edge
         g.add_edge(u, v) if command == 'add' else g.remove_edge(u, v)
         print('{:<10}'.format(case), g.has_cycle())
+
+    print("\nPDF - has_cycle(return_cycle=True) example 1")
+    print("--------------------------------------------")
+    g = UndirectedGraph(['AB', 'BC', 'CD', 'DB', 'DE'])
+    print(g.has_cycle(return_cycle=True))
+    g.remove_edge('C', 'D')
+    print(g.has_cycle(return_cycle=True))
+
+    print("\nPDF - method same_component() / component_of() example 1")
+    print("--------------------------------------------------------")
+    g = UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG'])
+    for u, v in ['AH', 'AQ', 'FQ']:
+        print(u, v, g.same_component(u, v), g.component_of(u), g.component_of(v))
+    g.add_edge('H', 'Q')
+    print('A', 'Q', g.same_component('A', 'Q'), g.count_connected_components())
+
+    print("\nPDF - method shortest_path() example 1")
+    print("--------------------------------------")
+    g = UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG'])
+    for u, v in ['AH', 'HA', 'DF', 'QF', 'BB']:
+        print(u, v, g.shortest_path(u, v))
+
+    print("\nPDF - method multi_bfs() example 1")
+    print("----------------------------------")
+    g = UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG'])
+    for source, hops in g.multi_bfs('ABGZ').items():
+        print(source, hops)
+
+    print("\nPDF - method iter_bfs() example 1")
+    print("---------------------------------")
+    g = UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG'])
+    for vertex, depth, parent in g.iter_bfs('A', with_info=True):
+        print(vertex, depth, parent, end=' | ')
+        if depth == 2:
+            break
+    print()